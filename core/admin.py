@@ -20,10 +20,10 @@ class CustomUserAdmin(BaseUserAdmin):
     
     Is Active? (Yes/No for active accounts)
     """
-    search_fields = ('email', 'first_name', 'last_name')
+    # email only: served by the pg_trgm index (core/migrations/0002), names would seq-scan
+    search_fields = ('email',)
     ordering = ('email',)
 
-
     #define the fields to show in the form
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
@@ -43,6 +43,14 @@ class CustomUserAdmin(BaseUserAdmin):
         Dates: Last login & join date
     """
 
+    # the model has no username column: the default add form would ask for one
+    add_fieldsets = (
+        (None, {
+            'classes': ('wide',),
+            'fields': ('email', 'first_name', 'password1', 'password2'),
+        }),
+    )
+
     #remove the default username field from the list and form
     filter_horizontal = ('groups', 'user_permissions')
 
@@ -53,6 +61,11 @@ class UserProfileAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'bio', 'avatar')
     search_fields = ('user__email', 'bio')
+    list_select_related = ('user',) # join the user in the changelist query (str(profile.user) -> email)
+
+    def get_queryset(self, request):
+        # FK -> select_related (JOIN), M2M -> prefetch_related (one extra IN query)
+        return super().get_queryset(request).select_related('user').prefetch_related('skills')
 
 
 #Register Skill and Category
@@ -73,7 +86,7 @@ class SiteStatsAdmin(admin.ModelAdmin):
     list_display = ('total_resources', 'total_users', 'total_goals_completed','last_updated')
     #Ensures no one can manually create more than one
     def has_add_permission(self, request):
-        return not SiteStats.objects.exists()
+        return not SiteStats.instance_exists()
 
 
 
@@ -1,10 +1,17 @@
 # learnhub/core/backends.py
+import secrets
+
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.db.models import Q
 
 UserModel = get_user_model()
 
+# Unsaved user holding a random hash; checked against on a miss so both
+# branches pay the same hasher cost (no email-enumeration timing oracle)
+_DUMMY_USER = UserModel(password=make_password(secrets.token_urlsafe(32)))
+
 
 class EmailBackend(ModelBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -15,10 +22,19 @@ class EmailBackend(ModelBackend):
             # Try to fetch user by email (case-insensitive)
             user = UserModel.objects.get(Q(email__iexact=username))
         except UserModel.DoesNotExist:
-            # Run the default password hasher once to reduce timing difference
-            UserModel().set_password(password)
+            # Same check_password work as the real path, result discarded
+            _DUMMY_USER.check_password(password)
             return None
 
         if user.check_password(password) and self.user_can_authenticate(user):
             return user
-        return None
\ No newline at end of file
+        return None
+
+    def get_user(self, user_id):
+        # request.user is loaded through here on every request; join the profile
+        # so request.user.profile (dashboard, navbar avatar) costs no extra query
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -1,8 +1,9 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm,AuthenticationForm
-from django.utils.text import slugify
+from django.db import transaction
 
-from .models import CustomUser, UserProfile, Skill
+from .models import CustomUser, UserProfile
+from .services import get_or_create_skills
 from django.contrib.auth import get_user_model
 
 
@@ -14,42 +15,30 @@ class CustomUserCreationForm(UserCreationForm):
         model = CustomUser
         fields = ('email', 'first_name', 'password1', 'password2')
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Hide username field instead of deleting it
-        if 'username' in self.fields:
-            self.fields['username'].widget = forms.HiddenInput()
-            self.fields['username'].required = False
-
     def save(self, commit=True):
         user = super().save(commit=False)
 
-        # Set email as username for compatibility
-        user.username = self.cleaned_data['email'].split('@')[0]
         user.email = self.cleaned_data['email']
         user.first_name = self.cleaned_data['first_name']
 
         if commit:
-            user.save()
-
-            # Create profile
-            profile, created = UserProfile.objects.get_or_create(
-                user=user,
-                defaults={'bio': self.cleaned_data.get('bio', '')}
-            )
-
-            # Handle skills
-            if self.cleaned_data.get('skills'):
-                skills_input = self.cleaned_data['skills']
-                skill_names = [s.strip() for s in skills_input.split(',') if s.strip()]
-
-                for skill_name in skill_names:
-                    skill, skill_created = Skill.objects.get_or_create(
-                        name=skill_name,
-                        defaults={'slug': slugify(skill_name)}
-                    )
-                    profile.skills.add(skill)
+            # User, profile and skills land together; ignore_conflicts makes
+            # concurrent signups adding the same skill a no-op instead of an IntegrityError
+            with transaction.atomic():
+                user.save()
+
+                # Create profile
+                profile, created = UserProfile.objects.get_or_create(
+                    user=user,
+                    defaults={'bio': self.cleaned_data.get('bio', '')}
+                )
+
+                # Handle skills
+                if self.cleaned_data.get('skills'):
+                    skills_input = self.cleaned_data['skills']
+                    skill_names = [s.strip() for s in skills_input.split(',') if s.strip()]
+
+                    profile.skills.add(*get_or_create_skills(skill_names).values_list('pk', flat=True))
 
         return user
 
@@ -0,0 +1,23 @@
+from django.contrib.auth import BACKEND_SESSION_KEY
+
+# Sessions created while ModelBackend was configured still record its path, and
+# django.contrib.auth only loads request.user through a configured backend
+LEGACY_AUTH_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+AUTH_BACKEND = 'core.backends.EmailBackend'
+
+
+class LegacySessionBackendMiddleware:
+    """
+    Point sessions stored with the removed ModelBackend at EmailBackend, so they
+    stay logged in without ModelBackend authenticating (and hashing) a second time
+    on every failed login. Must sit between SessionMiddleware and AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # No session cookie: the session store is never queried
+        if request.session.get(BACKEND_SESSION_KEY) == LEGACY_AUTH_BACKEND:
+            request.session[BACKEND_SESSION_KEY] = AUTH_BACKEND
+        return self.get_response(request)
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+# Trigram index backing the admin's email ILIKE '%q%' search.
+# pg_trgm is PostgreSQL-only, so this is a no-op on the SQLite dev database.
+CREATE_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm;',
+    'CREATE INDEX IF NOT EXISTS core_customuser_email_gin_trgm_idx '
+    'ON core_customuser USING gin (UPPER(email) gin_trgm_ops);',
+]
+DROP_SQL = [
+    'DROP INDEX IF EXISTS core_customuser_email_gin_trgm_idx;',
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgres(CREATE_SQL), _run_on_postgres(DROP_SQL)),
+    ]
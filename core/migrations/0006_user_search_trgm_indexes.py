@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+# Trigram indexes for unified_search's user half (first_name/last_name/bio icontains;
+# email is covered by 0002). Django compiles icontains to UPPER(col) LIKE UPPER(%s),
+# hence the UPPER() expressions. PostgreSQL-only; no-op on SQLite.
+CREATE_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm;',
+    'CREATE INDEX IF NOT EXISTS core_customuser_first_name_gin_trgm_idx '
+    'ON core_customuser USING gin (UPPER(first_name) gin_trgm_ops);',
+    'CREATE INDEX IF NOT EXISTS core_customuser_last_name_gin_trgm_idx '
+    'ON core_customuser USING gin (UPPER(last_name) gin_trgm_ops);',
+    'CREATE INDEX IF NOT EXISTS core_userprofile_bio_gin_trgm_idx '
+    'ON core_userprofile USING gin (UPPER(bio) gin_trgm_ops);',
+]
+DROP_SQL = [
+    'DROP INDEX IF EXISTS core_customuser_first_name_gin_trgm_idx;',
+    'DROP INDEX IF EXISTS core_customuser_last_name_gin_trgm_idx;',
+    'DROP INDEX IF EXISTS core_userprofile_bio_gin_trgm_idx;',
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_customuser_user_email_upper_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgres(CREATE_SQL), _run_on_postgres(DROP_SQL)),
+    ]
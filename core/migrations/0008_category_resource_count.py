@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def backfill_resource_count(apps, schema_editor):
+    Category = apps.get_model('core', 'Category')
+    counts = {}
+    for model_name in ('Book', 'Article', 'Course'):
+        model = apps.get_model('resources', model_name)
+        rows = model.objects.filter(category__isnull=False).values('category').annotate(n=models.Count('pk'))
+        for row in rows:
+            counts[row['category']] = counts.get(row['category'], 0) + row['n']
+    for category_id, count in counts.items():
+        Category.objects.filter(pk=category_id).update(resource_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_customuser_user_first_name_upper_idx'),
+        ('resources', '0008_resource_search_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='resource_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_resource_count, migrations.RunPython.noop),
+    ]
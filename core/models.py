@@ -1,8 +1,9 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser, PermissionsMixin
+from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.contrib.auth.models import BaseUserManager
+from django.core.cache import cache
+from django.db.models.functions import Upper
 from django.utils import timezone
-from django.template.defaultfilters import slugify #used for auto-generating clean URLs
 
 
 # Create your models here.
@@ -20,11 +21,6 @@ class CustomUserManager(BaseUserManager):
 
         email = self.normalize_email(email) # Makes "John@GMAIL.com" → "john@gmail.com"
 
-        #autogenerate username from email
-        if 'username' not in extra_fields:
-            extra_fields['username'] = email.split('@')[0]
-
-
         user = self.model(email=email, **extra_fields)  # Creates user object
         user.set_password(password) # Securely hashes the password
         user.save(using=self._db)  # Saves to database
@@ -51,20 +47,12 @@ class CustomUserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 #2 Custom User model
-class CustomUser(AbstractUser, PermissionsMixin):
+class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     """
     The main user model for authentication and authorization.
-    Uses email for  the unique identification
+    Uses email for  the unique identification (no username column)
     """
-    username = models.CharField(
-        max_length=150,
-        unique=True,
-        blank=True,
-        null=True,
-        help_text='Optional. Not used for login.'
-    )
-
     email = models.EmailField(max_length=255, unique=True)
     first_name = models.CharField(max_length=30, blank=True)
     last_name = models.CharField(max_length=30, blank=True)
@@ -77,6 +65,7 @@ class CustomUser(AbstractUser, PermissionsMixin):
     objects = CustomUserManager()
 
     #Define the unique identifier for login
+    EMAIL_FIELD = 'email'
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name'] # NO OTHER FIELDS ARE REQUIRED FOR INITIAL CREATION
 
@@ -111,6 +100,24 @@ class CustomUser(AbstractUser, PermissionsMixin):
     class Meta:
         verbose_name = 'user'
         verbose_name_plural = 'users'
+        # email is unique (already btree-indexed), so the admin ORDER BY email uses that;
+        # date_joined backs the "newest users" ordering in search
+        indexes = [
+            models.Index(fields=['-date_joined'], name='core_user_date_joined_idx'),
+            # email__iexact (login, profile lookup) compares UPPER(email)
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+            # profile_detail's first_name__iexact fallback in the same OR
+            models.Index(Upper('first_name'), name='user_first_name_upper_idx'),
+        ]
+
+    def clean(self):
+        super().clean()
+        self.email = self.__class__.objects.normalize_email(self.email)
+
+    @property
+    def username(self):
+        """Display handle (email prefix) for templates; not stored or used for login."""
+        return self.email.split('@')[0] if self.email else ''
 
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
@@ -119,16 +126,6 @@ class CustomUser(AbstractUser, PermissionsMixin):
 
         return self.first_name or  self.email
 
-    def save(self, *args, **kwargs):
-        #Auto-generate username from email if not provided
-        if not self.username and self.email:
-            #use email prefix as username
-            self.username = self.email.split('@')[0]
-
-        super().save(*args,**kwargs )
-
-
-
     def __str__(self):
         return self.email
 
@@ -151,11 +148,6 @@ class Skill(models.Model):
     class Meta:
         ordering = ('name',)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.name
 
@@ -179,6 +171,10 @@ class UserProfile(models.Model):
     goals_archived_count = models.IntegerField(default=0)
     join_date = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-join_date'], name='core_profile_join_date_idx'),
+        ]
 
     def __str__(self):
         return f"Profile for {self.user.email}"
@@ -200,14 +196,16 @@ class Category(models.Model):
     slug = models.SlugField(unique=True, max_length=50)
     icon_class = models.CharField(max_length=50, blank=True,
                                   help_text="Font Awesome class, e.g., fas fa-code")
+    # Books + articles + courses in this category, kept current by the resource
+    # save/delete signals in core/signals.py (home page orders by it)
+    resource_count = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+
     class Meta:
         verbose_name_plural = 'categories'
         ordering = ('name',)
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+    HOME_CACHE_KEY = 'core:home:categories'
+    CHOICES_CACHE_KEY = 'core:category:choices'
 
     def __str__(self):
         return self.name
@@ -227,9 +225,26 @@ class SiteStats(models.Model):
         verbose_name_plural = 'Site Statistics'
         verbose_name = 'Site Statistic'
 
+    EXISTS_CACHE_KEY = 'core:sitestats:exists'
+    # The default cache is per process and only this process's signals clear it: the
+    # TTL bounds how long another worker's flag can be stale
+    EXISTS_CACHE_SECONDS = 60
+
     def  __str__(self):
         return "Site Statistics Instance"
 
+    @classmethod
+    def instance_exists(cls):
+        """
+        Cached "is the singleton there?" flag for the admin's add button; cleared by the
+        save/delete signals in core/signals.py. Too stale to guard writes, see save()
+        """
+        exists = cache.get(cls.EXISTS_CACHE_KEY)
+        if exists is None:
+            exists = cls.objects.exists()
+            cache.set(cls.EXISTS_CACHE_KEY, exists, cls.EXISTS_CACHE_SECONDS)
+        return exists
+
     #Optional : to ensuer only one instance can exist
     def save(self, *args, **kwargs):
         if self.pk is None and SiteStats.objects.exists():
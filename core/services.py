@@ -0,0 +1,83 @@
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.text import slugify
+
+from resources.models import Article, Book, Course
+from .models import Category, Skill
+
+# Category (id, name) pairs for the resource form dropdowns; cleared by the
+# Category save/delete signals, the TTL only bounds edits that bypass them
+CATEGORY_CHOICES_CACHE_SECONDS = 60 * 60
+
+
+def get_or_create_skills(skill_names):
+    """
+    Returns the Skill rows for the given names, creating missing ones in bulk.
+
+    One SELECT for existing names, one INSERT for the rest and one SELECT to
+    pick up the new PKs. ignore_conflicts turns a concurrent insert of the
+    same skill into a no-op instead of an IntegrityError.
+    """
+    skill_names = list(dict.fromkeys(skill_names))
+    if not skill_names:
+        return Skill.objects.none()
+
+    existing = set(
+        Skill.objects.filter(name__in=skill_names).values_list('name', flat=True)
+    )
+    Skill.objects.bulk_create(
+        [Skill(name=name, slug=slugify(name)) for name in skill_names if name not in existing],
+        ignore_conflicts=True,
+    )
+    return Skill.objects.filter(name__in=skill_names)
+
+
+def get_category_choices():
+    """
+    (id, name) pairs for every category, ordered by name, from the cache.
+
+    Resource forms render the category dropdown from this instead of
+    evaluating Category.objects.all() for each form instance.
+    """
+    return cache.get_or_set(
+        Category.CHOICES_CACHE_KEY,
+        lambda: list(Category.objects.values_list('id', 'name')),
+        CATEGORY_CHOICES_CACHE_SECONDS,
+    )
+
+
+RESOURCE_MODELS = (Book, Article, Course)
+
+
+def refresh_category_resource_counts(category_ids):
+    """
+    Recount Category.resource_count for the given categories in one UPDATE
+    (a correlated COUNT per resource table), so the counter can't drift
+    """
+    category_ids = {pk for pk in category_ids if pk is not None}
+    if not category_ids:
+        return
+    book_count, article_count, course_count = (
+        Coalesce(
+            Subquery(
+                model.objects.filter(category=OuterRef('pk')).order_by()
+                .values('category').annotate(n=Count('pk')).values('n')
+            ),
+            0,
+        )
+        for model in RESOURCE_MODELS
+    )
+    Category.objects.filter(pk__in=category_ids).update(
+        resource_count=book_count + article_count + course_count
+    )
+
+
+def category_resources_changed(category_ids):
+    """
+    Resources in these categories changed in bulk (.update() sends no post_save):
+    do what the resource signals in core/signals.py would, recount the categories
+    and drop the cached home page categories
+    """
+    refresh_category_resource_counts(category_ids)
+    cache.delete(Category.HOME_CACHE_KEY)
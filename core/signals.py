@@ -1,7 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import UserProfile
+from django.core.cache import cache
+from django.template.defaultfilters import slugify
+from goals.models import GoalMilestone, LearningGoal
+from resources.models import Article, Book, Course
+from .models import Category, SiteStats, Skill, UserProfile
+from .services import refresh_category_resource_counts
 
 
 User = get_user_model()
@@ -12,6 +17,9 @@ def create_user_profile(sender, instance, created, **kwargs):
     """
     create a Userprofile whenever a new user is created
 
+    Profile edits are saved explicitly where they happen, so plain user
+    saves (last_login, admin edits, password changes) don't touch the profile.
+
         :param sender:
     :param instance:
     :param created:
@@ -21,19 +29,110 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
 
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+
+@receiver(post_save, sender=SiteStats)
+@receiver(post_delete, sender=SiteStats)
+def clear_site_stats_exists_cache(sender, **kwargs):
     """
-        Save the userProfile whenever the user is saved
-    :param sender:
-    :param instance:
-    :param kwargs:
-    :return:
+    Drop the cached singleton flag so SiteStats.instance_exists() re-checks the DB
     """
+    cache.delete(SiteStats.EXISTS_CACHE_KEY)
 
-    try:
-        instance.profile.save()
-    except UserProfile.DoesNotExist:
-        #if user profile does not exist create
-        UserProfile.objects.create(user=instance)
 
+@receiver(post_init, sender=Book)
+@receiver(post_init, sender=Article)
+@receiver(post_init, sender=Course)
+def remember_resource_category(sender, instance, **kwargs):
+    """
+    Remember the category and approval a resource was loaded with, so a re-categorised
+    save recounts the old category too and plain edits leave the home cache alone.
+    Read from __dict__ so deferred fields (.only()) don't cost a query.
+    """
+    instance._loaded_category_id = instance.__dict__.get('category_id')
+    instance._loaded_is_approved = instance.__dict__.get('is_approved')
+
+
+# Connected before update_category_resource_count, which moves _loaded_category_id forward
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Course)
+def clear_home_categories_cache_on_resource_save(sender, instance, created, **kwargs):
+    """
+    Drop the cached home page categories only when a resource joined, left or
+    changed category, or was (un)approved; views, upvotes and text edits don't
+    """
+    is_approved = instance.__dict__.get('is_approved')
+    if (
+        created
+        or getattr(instance, '_loaded_category_id', None) != instance.__dict__.get('category_id')
+        or getattr(instance, '_loaded_is_approved', None) != is_approved
+    ):
+        cache.delete(Category.HOME_CACHE_KEY)
+    instance._loaded_is_approved = is_approved
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Article)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Course)
+def update_category_resource_count(sender, instance, **kwargs):
+    """
+    Keep Category.resource_count current for the categories a resource left and joined
+    """
+    loaded_category_id = getattr(instance, '_loaded_category_id', None)
+    category_id = instance.__dict__.get('category_id')
+    # plain edits (views, upvotes, text) leave the counts alone
+    if kwargs.get('created') is False and loaded_category_id == category_id:
+        return
+    refresh_category_resource_counts({loaded_category_id, category_id})
+    instance._loaded_category_id = category_id
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Article)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def clear_home_categories_cache(sender, **kwargs):
+    """
+    Categories changed or a resource was deleted: drop the cached home page
+    categories list and the resource forms' category choices
+    """
+    cache.delete_many([Category.HOME_CACHE_KEY, Category.CHOICES_CACHE_KEY])
+
+
+@receiver(pre_save, sender=Skill)
+@receiver(pre_save, sender=Category)
+def populate_slug(sender, instance, **kwargs):
+    """
+    Slugify the name when no slug was given. bulk_create skips this,
+    so batch callers pre-assign slugs themselves (see CustomUserCreationForm.save)
+    """
+    if not instance.slug:
+        instance.slug = slugify(instance.name)
+
+
+@receiver(post_save, sender=LearningGoal)
+@receiver(post_delete, sender=LearningGoal)
+def clear_goal_board_cache(sender, instance, **kwargs):
+    """
+    A goal was created, edited or deleted (views, enrollment, admin): drop its owner's cached board
+    """
+    LearningGoal.clear_board_cache(instance.user_id)
+
+
+@receiver(post_save, sender=GoalMilestone)
+@receiver(post_delete, sender=GoalMilestone)
+def clear_milestone_goal_board_cache(sender, instance, **kwargs):
+    """
+    Milestones are on the board cards (and move the goal's counters): drop the owner's cached board.
+    The goal is usually already loaded; if it was deleted too, its own receiver clears the board
+    """
+    if GoalMilestone.goal.is_cached(instance):
+        user_id = instance.goal.user_id
+    else:
+        user_id = LearningGoal.objects.filter(pk=instance.goal_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        LearningGoal.clear_board_cache(user_id)
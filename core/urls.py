@@ -1,5 +1,3 @@
-import profile
-
 from django.urls import path
 from .views import *
 urlpatterns = [
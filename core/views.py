@@ -1,27 +1,60 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Q, Case, When, Sum
+from django.db.models import Count, Exists, F, OuterRef, Q, Case, When, Sum, Value
 from django.contrib.auth import logout, get_user_model,authenticate,login
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import IntegrityError, connection, models, transaction
 # FIX: Import BaseResource, which is the functional replacement for the old Resource model.
 # Also import concrete models for type checking if needed later.
 
 from goals.models import LearningGoal
-from resources.models import  BaseResource , UserResourceInteraction , Book , Article, Course
+from resources.models import  BaseResource , UserResourceInteraction , Book , Article, Course, Tag
+from resources.models import RESOURCE_SEARCH_CONFIG, resource_search_vector
 from django.utils.text import slugify
 from core.models import SiteStats, Category, CustomUser, UserProfile ,Skill # Use 'core' models as source
-from django.views.decorators.cache import never_cache
+from core.services import get_or_create_skills
+from django.views.decorators.cache import cache_page, never_cache
 from django.views.decorators.debug import sensitive_post_parameters
+from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
 from django.views import View
+from django.http import Http404, JsonResponse
 from django.utils.http import url_has_allowed_host_and_scheme # Keep import here for clarity
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from itertools import chain
 
+import json
 import logging
+import math
+import re
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# local@domain.tld, compiled once at import
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Columns the dashboard's recent-resources list (and the profile page's shared list) renders
+DASHBOARD_RESOURCE_FIELDS = (
+    'title', 'slug', 'description', 'difficulty', 'is_approved',
+    'upvote_count', 'created_at', 'category', 'category__name',
+)
+
+# Concrete resource tables merged by the dashboard's recent-resources UNION
+RECENT_RESOURCE_MODELS = {'book': Book, 'article': Article, 'course': Course}
+DASHBOARD_RECENT_LIMIT = 10
+
+# Resources per search page (keyset-paginated)
+SEARCH_PAGE_SIZE = 20
+
+# Anonymous landing page is identical for every visitor
+HOME_CACHE_SECONDS = 60 * 15
+# Top-categories list, also cached outside the page cache
+HOME_CATEGORIES_CACHE_SECONDS = 60 * 5
+
 
 # ----------------------------------------------------------------------
 # 1. AUTHENTICATION VIEWS (Django Built-in Views Handled in URLs)
@@ -41,6 +74,37 @@ def logout_view(request):
 User = get_user_model()
 
 
+def _wants_json(request):
+    """fetch/XHR clients get JSON errors instead of a re-rendered page"""
+    return (
+        request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+        or request.get_preferred_type(['text/html', 'application/json']) == 'application/json'
+    )
+
+
+def _auth_error(request, errors, template_name, context, status=400):
+    """
+    Validation failure in register/login: a small JSON body for AJAX callers,
+    otherwise flash the messages and re-render the form as before.
+    """
+    if isinstance(errors, str):
+        errors = [errors]
+    if _wants_json(request):
+        return JsonResponse({'errors': errors}, status=status)
+    for error in errors:
+        messages.error(request, error)
+    return render(request, template_name, context)
+
+
+def _login_email_key(group, request):
+    """
+    Rate-limit key for login attempts: the submitted email, normalised the way login_view reads it
+    """
+    return request.POST.get('username', '').strip().lower()
+
+
+# Shed bot signups before the password hashing and DB writes run
+@ratelimit(key='ip', rate='15/15m', method='POST', block=True)
 def register_view(request):
     # ... (Register view logic unchanged) ...
     if request.method == 'POST':
@@ -54,61 +118,59 @@ def register_view(request):
 
         # Validate
         if not all([first_name, email, password1, password2]):
-            messages.error(request, 'Please fill all required fields')
-            return render(request, 'authentication/registration.html', {'form': request.POST})
+            return _auth_error(request, 'Please fill all required fields', 'authentication/registration.html', {'form': request.POST})
+
+        if not _EMAIL_RE.match(email):
+            return _auth_error(request, 'Please enter a valid email address', 'authentication/registration.html', {'form': request.POST})
 
         if password1 != password2:
-            messages.error(request, 'Passwords do not match')
-            return render(request, 'authentication/registration.html', {'form': request.POST})
+            return _auth_error(request, 'Passwords do not match', 'authentication/registration.html', {'form': request.POST})
 
         if len(password1) < 8:
-            messages.error(request, 'Password must be at least 8 characters')
-            return render(request, 'authentication/registration.html', {'form': request.POST})
+            return _auth_error(request, 'Password must be at least 8 characters', 'authentication/registration.html', {'form': request.POST})
 
         if not terms_accepted:
-            messages.error(request, 'You must agree to the terms')
-            return render(request, 'authentication/registration.html', {'form': request.POST})
-
-        if User.objects.filter(email=email).exists():
-            messages.error(request, 'Email already registered')
-            return redirect('login')
+            return _auth_error(request, 'You must agree to the terms', 'authentication/registration.html', {'form': request.POST})
 
         try:
-            # Create user
-            user = User.objects.create_user(
-                email=email,
-                password=password1,
-                first_name=first_name,
-            )
-
-            # Get or create profile
-            profile, created = UserProfile.objects.get_or_create(
-                user=user,
-                defaults={'bio': bio}
-            )
-
-            if not created:
-                # Update existing profile
-                profile.bio = bio
-                profile.save()
-
-            # Add skills
-            if skills_input:
-                for skill_name in skills_input.split(','):
-                    skill_name = skill_name.strip()
-                    if skill_name:
-                        skill, _ = Skill.objects.get_or_create(
-                            name=skill_name,
-                            defaults={'slug': slugify(skill_name)}
-                        )
-                        profile.skills.add(skill)
+            # User, profile and skills commit together (no half-created accounts).
+            # No exists() pre-check: the unique email constraint rejects duplicates,
+            # including two concurrent signups with the same address
+            with transaction.atomic():
+                # Create user
+                user = User.objects.create_user(
+                    email=email,
+                    password=password1,
+                    first_name=first_name,
+                )
+
+                # Get or create profile
+                profile, created = UserProfile.objects.get_or_create(
+                    user=user,
+                    defaults={'bio': bio}
+                )
+
+                if not created:
+                    # Update existing profile
+                    profile.bio = bio
+                    profile.save()
+
+                # Add skills (batched: constant queries regardless of how many were entered)
+                skill_names = [s.strip() for s in skills_input.split(',') if s.strip()]
+                if skill_names:
+                    profile.skills.add(*get_or_create_skills(skill_names).values_list('pk', flat=True))
 
             messages.success(request, 'Account created! Please login.')
             return redirect('login')
 
+        except IntegrityError:
+            if _wants_json(request):
+                return JsonResponse({'errors': ['Email already registered']}, status=409)
+            messages.error(request, 'Email already registered')
+            return redirect('login')
+
         except Exception as e:
-            messages.error(request, f'Error: {str(e)}')
-            return render(request, 'authentication/registration.html', {'form': request.POST})
+            return _auth_error(request, f'Error: {str(e)}', 'authentication/registration.html', {'form': request.POST}, status=500)
 
     return render(request, 'authentication/registration.html')
 
@@ -121,6 +183,9 @@ def register_view(request):
 # Decorators for security
 @sensitive_post_parameters('password')
 @never_cache
+# Credential stuffing: cap attempts per account and per client before authenticate() hashes anything
+@ratelimit(key=_login_email_key, rate='5/15m', method='POST', block=True)
+@ratelimit(key='ip', rate='20/15m', method='POST', block=True)
 def login_view(request):
     # ... (Login view logic unchanged) ...
     """
@@ -149,31 +214,21 @@ def login_view(request):
             errors.append('Password cannot be empty')
 
         if errors:
-            for error in errors:
-                messages.error(request, error)
-            return render(request, 'authentication/login.html', {'form': {'username': email}})
+            return _auth_error(request, errors, 'authentication/login.html', {'form': {'username': email}})
 
         # Additional email validation
-        if '@' not in email or '.' not in email.split('@')[-1]:
-            messages.error(request, 'Please enter a valid email address')
-            return render(request, 'authentication/login.html', {'form': {'username': email}})
+        if not _EMAIL_RE.match(email):
+            return _auth_error(request, 'Please enter a valid email address', 'authentication/login.html', {'form': {'username': email}})
 
         try:
-            # Check if user exists before attempting authentication
-            user_exists = User.objects.filter(email=email).exists()
-
-            if not user_exists:
-                messages.error(request, 'No account found with this email')
-                return render(request, 'authentication/login.html', {'form': {'username': email}})
-
-            # Authenticate user
+            # Authenticate user: unknown email and wrong password both return None
+            # (one query, same message, no account-enumeration oracle)
             user = authenticate(request, username=email, password=password)
 
             if user is not None:
                 # Check if account is active
                 if not user.is_active:
-                    messages.error(request, 'Your account is inactive. Please contact support.')
-                    return render(request, 'authentication/login.html', {'form': {'username': email}})
+                    return _auth_error(request, 'Your account is inactive. Please contact support.', 'authentication/login.html', {'form': {'username': email}}, status=403)
 
                 # Login successful
                 login(request, user)
@@ -187,7 +242,7 @@ def login_view(request):
                     request.session.set_expiry(2592000)  # 30 days in seconds
 
                 # Log login activity (optional)
-                print(f"User {email} logged in successfully")
+                logger.info("User %s logged in", email)
 
                 # Get next URL or default redirect
                 next_url = request.POST.get('next') or request.GET.get('next') or 'home'
@@ -200,14 +255,12 @@ def login_view(request):
 
             else:
                 # Invalid credentials
-                messages.error(request, 'Invalid email or password')
-                return render(request, 'authentication/login.html', {'form': {'username': email}})
+                return _auth_error(request, 'Invalid email or password', 'authentication/login.html', {'form': {'username': email}}, status=401)
 
-        except Exception as e:
-            # Log the error for debugging
-            print(f"Login error: {str(e)}")
-            messages.error(request, 'An error occurred during login. Please try again.')
-            return render(request, 'authentication/login.html', {'form': {'username': email}})
+        except Exception:
+            # Log the error (with traceback) for debugging
+            logger.exception("Login error")
+            return _auth_error(request, 'An error occurred during login. Please try again.', 'authentication/login.html', {'form': {'username': email}}, status=500)
 
     # GET request - show login form
     # Pass next parameter to template if present
@@ -235,7 +288,7 @@ def dashboard(request):
     """
     user = request.user
 
-    # Safely get or create profile
+    # Safely get or create profile (joined onto request.user by EmailBackend.get_user)
     try:
         profile = user.profile
     except UserProfile.DoesNotExist:
@@ -252,78 +305,76 @@ def dashboard(request):
     elif hasattr(profile, 'goals_achieved_count'):
         goals_achieved = profile.goals_achieved_count
 
-    # --- 1. Get recent resources (Fixing the UNION error) ---
-
-    # Query top resources from each concrete model and combine/sort in Python.
-    # This avoids the SQL UNION error and preserves model instance functionality.
-
-    recent_resources_list = []
-
-    # Query 10 of each type uploaded by the user
-    recent_resources_list.extend(
-        Book.objects.filter(author=user)
-        .select_related('category')
-        .prefetch_related('tags')
-        .order_by('-created_at')[:10]
+    # --- 1. Get recent resources ---
+
+    # The concrete tables have different columns, so UNION only the sort keys:
+    # the database merge-sorts and returns the 10 newest (kind, id) pairs, and
+    # only those rows are hydrated (and have their tags prefetched) per model.
+    key_querysets = [
+        model.objects.filter(author=user)
+        .annotate(kind=Value(kind)).values('id', 'created_at', 'kind').order_by()
+        for kind, model in RECENT_RESOURCE_MODELS.items()
+    ]
+    recent_keys = list(
+        key_querysets[0].union(*key_querysets[1:], all=True).order_by('-created_at')[:DASHBOARD_RECENT_LIMIT]
     )
 
-    recent_resources_list.extend(
-        Article.objects.filter(author=user)
-        .select_related('category')
-        .prefetch_related('tags')
-        .order_by('-created_at')[:10]
-    )
+    ids_by_kind = {}
+    for key in recent_keys:
+        ids_by_kind.setdefault(key['kind'], []).append(key['id'])
 
-    recent_resources_list.extend(
-        Course.objects.filter(author=user)
+    # only(): the listing never reads the wide per-type columns (Article.content,
+    # Course.roadmap_json, ...); comment counts come from the same query.
+    # At most DASHBOARD_RECENT_LIMIT rows by pk, so the lookups run on the request
+    # thread (and its connection/transaction) one after another
+    hydrate_querysets = [
+        RECENT_RESOURCE_MODELS[kind].objects.filter(pk__in=ids)
         .select_related('category')
         .prefetch_related('tags')
-        .order_by('-created_at')[:10]
-    )
-
-    # Sort the combined list in Python and take the final top 10
-    recent_resources = sorted(
-        recent_resources_list,
-        key=lambda r: r.created_at,
-        reverse=True
-    )[:10]
-
-    # --- 2. Get resource stats (Counts) ---
-
-    total_resources = (
-            Book.objects.filter(author=user).count() +
-            Article.objects.filter(author=user).count() +
-            Course.objects.filter(author=user).count()
-    )
-
-    approved_resources = (
-            Book.objects.filter(author=user, is_approved=True).count() +
-            Article.objects.filter(author=user, is_approved=True).count() +
-            Course.objects.filter(author=user, is_approved=True).count()
-    )
-
-    # --- 3. Get total upvotes received (Fixing the TypeError) ---
-
-    # Must use parentheses to ensure `or 0` resolves None before summation
-    total_upvotes_received = (
-            (Book.objects.filter(author=user)
-             .aggregate(total_upvotes=Sum('upvote_count'))['total_upvotes'] or 0)
-            +
-            (Article.objects.filter(author=user)
-             .aggregate(total_upvotes=Sum('upvote_count'))['total_upvotes'] or 0)
-            +
-            (Course.objects.filter(author=user)
-             .aggregate(total_upvotes=Sum('upvote_count'))['total_upvotes'] or 0)
-    )
+        .only(*DASHBOARD_RESOURCE_FIELDS)
+        .annotate(comment_count=Count('comments'))
+        for kind, ids in ids_by_kind.items()
+    ]
+    resources_by_key = {}
+    for resource in chain.from_iterable(hydrate_querysets):
+        resources_by_key[(resource.get_resource_type().lower(), resource.pk)] = resource
+
+    # Keep the database's newest-first order
+    recent_resources = [
+        resources_by_key[(key['kind'], key['id'])]
+        for key in recent_keys
+        if (key['kind'], key['id']) in resources_by_key
+    ]
+
+    # --- 2 & 3. Resource stats: counts and upvotes in one aggregate per concrete table ---
+
+    total_resources = approved_resources = total_upvotes_received = 0
+    if len(recent_keys) < DASHBOARD_RECENT_LIMIT:
+        # The UNION came back short, so it already returned every resource the user
+        # has (none, for a new account): count those rows instead of querying again
+        total_resources = len(recent_resources)
+        approved_resources = sum(resource.is_approved for resource in recent_resources)
+        total_upvotes_received = sum(resource.upvote_count for resource in recent_resources)
+    else:
+        for model in (Book, Article, Course):
+            stats = model.objects.filter(author=user).aggregate(
+                total=Count('id'),
+                approved=Count('id', filter=Q(is_approved=True)),
+                upvotes=Sum('upvote_count'),
+            )
+            total_resources += stats['total']
+            approved_resources += stats['approved']
+            # Sum() is None on an empty table
+            total_upvotes_received += stats['upvotes'] or 0
 
     # --- 4. Get Learning Goals ---
-    learning_goals = []
-    try:
-        learning_goals = LearningGoal.objects.filter(
-            user=user
-        ).order_by('-created_at')[:3]
-    except Exception as e:
-        logger.debug(f"Could not load goals: {e}")
+    # Evaluated here so a DB error surfaces from the view, not mid-render;
+    # only the columns the goals card shows
+    learning_goals = list(
+        LearningGoal.objects.filter(user=user)
+        .only('title', 'description', 'status', 'due_date')
+        .order_by('-created_at')[:3]
+    )
 
     # --- 5. Context preparation ---
 
@@ -354,28 +405,28 @@ def dashboard(request):
 # Simple Home/Landing Page
 def home(request):
     """
-    Public-facing landing page. Fixed FieldError by using specific related_names
-    for each concrete resource type.
+    Public-facing landing page. Authenticated users are redirected before
+    the cache is consulted, so only the anonymous page is ever cached.
     """
     if request.user.is_authenticated:
         return redirect('dashboard')
 
+    return _home_cached(request)
+
+
+@cache_page(HOME_CACHE_SECONDS, key_prefix='home_anon')
+def _home_cached(request):
+    """
+    Renders the anonymous landing page. Fixed FieldError by using specific related_names
+    for each concrete resource type.
+    """
     # Query site-wide statistics
     stats = SiteStats.objects.first()
 
-    # Get categories, annotated with the sum of all resource types
-    categories = Category.objects.annotate(
-        article_count=Count('resources_article_resources', distinct=True),
-        book_count=Count('resources_book_resources', distinct=True),
-        course_count=Count('resources_course_resources', distinct=True)
-    ).annotate(
-        # Sum the counts together for the total 'resource_count'
-        resource_count=(
-            models.F('article_count') +
-            models.F('book_count') +
-            models.F('course_count')
-        )
-    ).order_by('-resource_count')[:8]
+    # Get categories, annotated with the sum of all resource types.
+    # Cached on its own as well, since ?next=/Vary variations miss the page cache;
+    # cleared by the resource/category save and delete signals in core/signals.py
+    categories = cache.get_or_set(Category.HOME_CACHE_KEY, _top_categories, HOME_CATEGORIES_CACHE_SECONDS)
 
     context = {
         'stats': stats,
@@ -385,6 +436,11 @@ def home(request):
     return render(request, 'index.html', context)
 
 
+def _top_categories():
+    # resource_count is a maintained counter column: an index scan, no JOINs
+    return list(Category.objects.order_by('-resource_count')[:8])
+
+
 @login_required()
 def profile_detail(request, user_identifier):
     """
@@ -393,13 +449,22 @@ def profile_detail(request, user_identifier):
     The function handles fetching the user, profile, and combining
     resources from all concrete models (Book, Article, Course).
     """
-    # 1. Fetch Target User
-    try:
-        # Prioritize email lookup
-        target_user = CustomUser.objects.get(email__iexact=user_identifier)
-    except CustomUser.DoesNotExist:
-        # Fallback to get_object_or_404 based on first_name/username (as per your original code)
-        target_user = get_object_or_404(CustomUser, first_name__iexact=user_identifier)
+    # 1. Fetch Target User: email or first_name in one JOINed query (email matches win),
+    # profile joined and skills prefetched since the template renders profile.skills.all
+    target_user = (
+        CustomUser.objects
+        .filter(Q(email__iexact=user_identifier) | Q(first_name__iexact=user_identifier))
+        .select_related('profile')
+        .prefetch_related('profile__skills')
+        .only(
+            'email', 'first_name', 'last_name', 'date_joined', 'is_staff',
+            'profile__user', 'profile__avatar', 'profile__bio',
+        )
+        .order_by(Case(When(email__iexact=user_identifier, then=0), default=1))
+        .first()
+    )
+    if target_user is None:
+        raise Http404('No user matches the given query.')
 
     profile = target_user.profile
 
@@ -412,20 +477,21 @@ def profile_detail(request, user_identifier):
 
     # Note: Book, Article, and Course must be imported at the top of views.py (they are).
 
-    # Fetch approved resources for the target_user, including related fields for the template
-    approved_books = Book.objects.filter(author=target_user, is_approved=True).select_related(
-        'category').prefetch_related('tags')
-    approved_articles = Article.objects.filter(author=target_user, is_approved=True).select_related(
-        'category').prefetch_related('tags')
-    approved_courses = Course.objects.filter(author=target_user, is_approved=True).select_related(
-        'category').prefetch_related('tags')
-
-    # Chain the querysets together. This returns an iterator of model instances.
-    shared_resources_qs = chain(approved_books, approved_articles, approved_courses)
+    # Newest 10 approved per model (served by the <model>_author_approved_idx
+    # (author, is_approved, -created_at) index), then the newest 10 overall.
+    # The profile cards render the same columns as the dashboard list; tags aren't shown.
+    shared_resources_qs = chain.from_iterable(
+        model.objects.filter(author=target_user, is_approved=True)
+        .select_related('category')
+        .only(*DASHBOARD_RESOURCE_FIELDS)
+        .annotate(comment_count=Count('comments'))
+        .order_by('-created_at')[:10]
+        for model in (Book, Article, Course)
+    )
 
-    # Convert to list and sort by created_at, then limit to the top 10
+    # Sort by created_at, then limit to the top 10
     shared_resources = sorted(
-        list(shared_resources_qs),
+        shared_resources_qs,
         key=lambda x: x.created_at,
         reverse=True
     )[:10]
@@ -439,23 +505,9 @@ def profile_detail(request, user_identifier):
             (Course.objects.filter(author=target_user).aggregate(total=Sum('upvote_count'))['total'] or 0)
     )
 
-    # Total comments received (Requires complex aggregation or simple list sum)
-    # Since resources are heterogeneous, we sum the comment count on the list itself:
-    # core/views.py (Inside profile_detail, Final Fix for Calculation)
-
-    # 3. Calculate Aggregated Stats (Optimized for the template)
-    # ... (total_upvotes calculation remains unchanged) ...
-
-    # Total comments received (Requires complex aggregation or simple list sum)
-    # Use a defensive check (hasattr) to ensure the attribute exists on the resource instance
-    total_comments_received = sum(
-        resource.comments.count()
-        for resource in shared_resources
-        if hasattr(resource, 'comments')  # <-- Defensive check added
-    )
-    # NOTE: This only counts comments on the top 10 resources.
-    # NOTE: This only counts comments on the top 10 resources. For an accurate total,
-    # you would need a more complex query targeting the Comment model.
+    # Total comments received on the listed resources, from the comment_count
+    # annotation (a JOIN + GROUP BY in the queries above, not one COUNT per resource)
+    total_comments_received = sum(resource.comment_count for resource in shared_resources)
 
     # 4. Context Preparation
     context = {
@@ -472,6 +524,60 @@ def profile_detail(request, user_identifier):
     return render(request, 'profile.html', context)
 
 
+def _keyset_after(fields, values):
+    """
+    Q matching rows that come strictly after `values` when ordered by `fields`, all descending:
+    (a < a0) OR (a = a0 AND b < b0) OR ...
+    """
+    condition = Q()
+    for i, field in enumerate(fields):
+        step = Q(**{f'{field}__lt': values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_field: prev_value})
+        condition |= step
+    return condition
+
+
+def _encode_search_cursor(values):
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return urlsafe_base64_encode(json.dumps(payload).encode())
+
+
+# Cursor ints are compared against integer columns: keep them in bigint range
+_CURSOR_INT_LIMIT = 2 ** 63
+
+
+def _is_cursor_int(value):
+    # bool is an int subclass, but JSON true/false is never a valid key
+    return type(value) is int and -_CURSOR_INT_LIMIT < value < _CURSOR_INT_LIMIT
+
+
+def _decode_search_cursor(raw, size):
+    """
+    Returns the sort key a cursor points at, or None (first page) if it is missing or malformed.
+    The cursor is user input: every element is type-checked here, so a crafted one
+    can't fail later while the keyset filter is built or run.
+    """
+    if not raw:
+        return None
+    try:
+        values = json.loads(urlsafe_base64_decode(raw))
+        if not isinstance(values, list) or len(values) != size:
+            return None
+        # rank (full-text only) and upvote_count first, then created_at, pk last
+        *scores, created_at, pk = values
+        if not _is_cursor_int(pk) or not isinstance(created_at, str):
+            return None
+        if not all(
+            _is_cursor_int(score) or (type(score) is float and math.isfinite(score))
+            for score in scores
+        ):
+            return None
+        return [*scores, datetime.fromisoformat(created_at), pk]
+    except (ValueError, TypeError):
+        return None
+
+
 def unified_search(request):
     """
     Handles site-wide search across Resources and Users.
@@ -484,29 +590,80 @@ def unified_search(request):
 
     if query:
         # --- 1. Resource Search (Fulfills Resource, Tag search) ---
-        # FIX: Target BaseResource for unified search
-        resource_queryset = BaseResource.objects.filter(is_approved=True).select_related('author',
-                                                                                     'category').prefetch_related(
-            'tags')
-
-        # Build resource search query (Q object)
-        resource_query = (
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(tags__name__icontains=query)
-        )
-
-        # Annotate results with interaction status for the current user if logged in (Phase 5)
-        if request.user.is_authenticated:
-            resource_queryset = resource_queryset.annotate(
-                is_upvoted=Case(When(interactions__user=request.user, interactions__upvoted=True, then=True),
-                                default=False, output_field=models.BooleanField()),
-                is_saved=Case(When(interactions__user=request.user, interactions__saved=True, then=True), default=False,
-                              output_field=models.BooleanField())
+        # BaseResource is abstract, so each concrete model is searched and the hits merged
+
+        # PostgreSQL: GIN-indexed full-text match on title/description, ranked by relevance.
+        # Other backends (SQLite in dev) keep the icontains scan.
+        use_full_text = connection.vendor == 'postgresql'
+        if use_full_text:
+            search_query = SearchQuery(query, config=RESOURCE_SEARCH_CONFIG)
+            text_query = Q(document=search_query)
+            sort_fields = ('rank', 'upvote_count', 'created_at', 'pk')
+        else:
+            # Build resource search query (Q object)
+            text_query = Q(title__icontains=query) | Q(description__icontains=query)
+            sort_fields = ('upvote_count', 'created_at', 'pk')
+        ordering = [f'-{field}' for field in sort_fields]
+
+        # Resolve matching tags once; each model then tests membership with an EXISTS
+        # on its tag through table instead of JOINing it (no row fan-out, no DISTINCT)
+        tag_ids = list(Tag.objects.filter(name__icontains=query).values_list('id', flat=True))
+
+        # Keyset pagination: ?cursor= carries the sort key of the last row shown
+        cursor = _decode_search_cursor(request.GET.get('cursor', ''), len(sort_fields))
+
+        for model in (Book, Article, Course):
+            resource_query = text_query
+            if tag_ids:
+                tag_links = model.tags.through.objects.filter(
+                    **{model.tags.field.m2m_field_name(): OuterRef('pk')},
+                    tag_id__in=tag_ids,
+                )
+                resource_query = resource_query | Exists(tag_links)
+
+            resource_queryset = model.objects.filter(is_approved=True)
+            if use_full_text:
+                resource_queryset = resource_queryset.annotate(
+                    document=resource_search_vector(),
+                    rank=SearchRank(F('document'), search_query),
+                )
+
+            resource_queryset = resource_queryset.filter(resource_query)
+            if cursor:
+                resource_queryset = resource_queryset.filter(_keyset_after(sort_fields, cursor))
+
+            # Annotate results with interaction status for the current user if logged in (Phase 5)
+            # EXISTS semi-joins: no LEFT JOIN fan-out, so no DISTINCT needed
+            if request.user.is_authenticated:
+                user_interactions = UserResourceInteraction.objects.filter(
+                    content_type=ContentType.objects.get_for_model(model),
+                    object_id=OuterRef('pk'),
+                    user=request.user,
+                )
+                resource_queryset = resource_queryset.annotate(
+                    is_upvoted=Exists(user_interactions.filter(upvoted=True)),
+                    is_saved=Exists(user_interactions.filter(saved=True)),
+                )
+
+            # At most a page per model (plus one row to tell whether there is a next page),
+            # tags via a single IN query
+            resource_results.extend(
+                resource_queryset.select_related('author', 'category')
+                .prefetch_related('tags')
+                .order_by(*ordering)[:SEARCH_PAGE_SIZE + 1]
             )
 
-        resource_results = resource_queryset.filter(resource_query).distinct().order_by('-upvote_count', '-created_at')[
-            :20]
+        resource_results = sorted(
+            resource_results,
+            key=lambda r: tuple(getattr(r, field) for field in sort_fields),
+            reverse=True
+        )
+        next_cursor = None
+        if len(resource_results) > SEARCH_PAGE_SIZE:
+            resource_results = resource_results[:SEARCH_PAGE_SIZE]
+            next_cursor = _encode_search_cursor(
+                [getattr(resource_results[-1], field) for field in sort_fields]
+            )
 
         # --- 2. User Search (Fulfills the userSearch) ---
         user_queryset = CustomUser.objects.filter(is_active=True).select_related('profile')
@@ -520,7 +677,10 @@ def unified_search(request):
             # Q(profile__skills__name__contains=query) # Uncomment if you enable Skill searching
         )
 
-        user_results = user_queryset.filter(user_query).distinct().order_by('-date_joined')[:10]
+        # Materialize once: len() and the template's loops reuse the same list.
+        # Users are only listed on the first page.
+        if not cursor:
+            user_results = list(user_queryset.filter(user_query).distinct().order_by('-date_joined')[:10])
 
         total_results_count = len(resource_results) + len(user_results)
 
@@ -529,11 +689,12 @@ def unified_search(request):
             'resource_results': resource_results,
             'user_results': user_results,
             'results_count': total_results_count,
+            'next_cursor': next_cursor,
         }
 
         # NOTE: The template path should be 'resources/search.html'
         return render(request, 'resources/search.html', context)
 
     # Render the search page template even if no query is present
-    context = {'query': '', 'resource_results': [], 'user_results': [], 'results_count': 0}
+    context = {'query': '', 'resource_results': [], 'user_results': [], 'results_count': 0, 'next_cursor': None}
     return render(request, 'resources/search.html', context)
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0002_learninggoal_content_type_learninggoal_object_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='learninggoal',
+            index=models.Index(fields=['user', 'status'], name='goal_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learninggoal',
+            index=models.Index(condition=models.Q(('status__in', ['N', 'I'])), fields=['user', 'due_date'], name='goal_user_due_idx'),
+        ),
+    ]
@@ -1,9 +1,11 @@
 # learnhub/goals/models.py
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
 from django.conf import settings
 from django.template.defaultfilters import slugify
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Now
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 
@@ -49,14 +51,41 @@ class LearningGoal(models.Model):
     class Meta:
         ordering = ('status', '-created_at')
         unique_together = ('user', 'slug')
+        indexes = [
+            # goal_list: a user's board, ordered by status
+            models.Index(fields=['user', 'status'], name='goal_user_status_idx'),
+            # overdue check: only open goals (Not Started / In Progress) carry a live due date
+            models.Index(fields=['user', 'due_date'], name='goal_user_due_idx', condition=Q(status__in=['N', 'I'])),
+        ]
+
+    # goal_list's board (plain dicts) per user; cleared by the LearningGoal/GoalMilestone
+    # save/delete signals in core/signals.py and by the queryset .update() callers
+    BOARD_CACHE_KEY = 'goals:board:{user_id}'
+
+    @classmethod
+    def board_cache_key(cls, user_id):
+        return cls.BOARD_CACHE_KEY.format(user_id=user_id)
+
+    @classmethod
+    def clear_board_cache(cls, user_id):
+        """
+        Drop the user's cached Kanban board once the current transaction commits
+        (so a concurrent goal_list can't re-cache pre-commit data)
+        """
+        transaction.on_commit(lambda: cache.delete(cls.board_cache_key(user_id)))
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            # Create a unique slug based on title and user
+            # Create a unique slug based on title. slug is unique across all users,
+            # so fetch every taken slug with this prefix in one query and pick the
+            # first free suffix in Python
             base_slug = slugify(self.title)
+            taken = set(
+                LearningGoal.objects.filter(slug__startswith=base_slug).values_list('slug', flat=True)
+            )
             unique_slug = base_slug
             num = 1
-            while LearningGoal.objects.filter(user=self.user, slug=unique_slug).exists():
+            while unique_slug in taken:
                 unique_slug = f'{base_slug}-{num}'
                 num += 1
             self.slug = unique_slug
@@ -80,36 +109,54 @@ class LearningGoal(models.Model):
     #New method recalculates and saves progress counters
     def update_progress_counters(self):
         """Aggregates and updates the milestone  counts on the goal"""
-
-        #Calculate total count and completed count directly from the related milestones
-        agg_data = self.milestones.aggregate(
-            total=Count('id'),
-            completed=Count('id', filter=models.Q(is_completed=True)),
+        LearningGoal.sync_progress_counters(self.pk)
+        self.refresh_from_db(fields=['milestone_count', 'milestone_completed_count', 'status', 'completed_at'])
+
+    def set_progress_counters(self, milestone_count, milestone_completed_count):
+        """
+        Apply sync_progress_counters' rules to this in-memory instance only (no query),
+        for callers that already know the new counts
+        """
+        self.milestone_count = milestone_count
+        self.milestone_completed_count = milestone_completed_count
+        if milestone_count > 0 and milestone_count == milestone_completed_count:
+            self.status = 'C'
+            if self.completed_at is None:
+                self.completed_at = timezone.now()
+        elif milestone_completed_count > 0 and self.status == 'N':
+            self.status = 'I'
+
+    @classmethod
+    def sync_progress_counters(cls, goal_id):
+        """
+        Recounts a goal's milestones and updates its counters/status in one UPDATE.
+        All milestones done -> Completed (stamping completed_at); some done -> In Progress
+        if it hadn't started. Counts come from correlated subqueries, so no SELECT first.
+        """
+        milestones = GoalMilestone.objects.filter(goal=OuterRef('pk')).order_by()
+        completed = milestones.filter(is_completed=True)
+        all_done = Exists(milestones) & ~Exists(milestones.filter(is_completed=False))
+
+        def count_of(queryset):
+            return Coalesce(
+                Subquery(queryset.values('goal').annotate(c=Count('pk')).values('c')),
+                0,
+            )
+
+        cls.objects.filter(pk=goal_id).update(
+            milestone_count=count_of(milestones),
+            milestone_completed_count=count_of(completed),
+            status=Case(
+                When(all_done, then=Value('C')),
+                When(Q(status='N') & Exists(completed), then=Value('I')),
+                default=F('status'),
+            ),
+            completed_at=Case(
+                When(Q(completed_at__isnull=True) & all_done, then=Now()),
+                default=F('completed_at'),
+            ),
         )
 
-        self.milestone_count = agg_data['total']
-        self.milestone_completed_count = agg_data['completed']
-
-
-        #Check if the goal should be auto-completed or marked in progress
-        if self.milestone_count > 0 and self.milestone_count == self.milestone_completed_count:
-            # if all the milestones are done , Mark the goal as completed
-            if self.status != 'C':
-                self.status = 'C'
-            elif self.milestone_completed_count > 0:
-                #if some milestones are done , ensure the status is in progress
-                if self.status == 'N':
-                    self.status = 'I'
-
-
-            #Save only the counter fields and status
-            self.save(update_fields=[
-                'milestone_count',
-                'milestone_completed_count',
-                'status',
-                'completed_at'
-            ])
-
 
 # 2. Goal Milestone Model (The Checklist Item)
 class GoalMilestone(models.Model):
@@ -139,8 +186,8 @@ class GoalMilestone(models.Model):
         super().save(*args, **kwargs)
 
 
-        #Trigger a process update: Update parent goal counter after saving
-        self.goal.update_progress_counters() #call the new method
+        #Trigger a process update: Update parent goal counter after saving (single UPDATE, goal not loaded)
+        LearningGoal.sync_progress_counters(self.goal_id)
 
     def __str__(self):
         return self.title
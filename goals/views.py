@@ -2,52 +2,84 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Prefetch, Q
+from django.db.models import Case, F, Q, Value, When
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.views.decorators.http import require_POST
+from django.core.cache import cache
 from django.db import transaction
+from django.utils import timezone
 
 from .models import LearningGoal, GoalMilestone, GoalUpdate
 from .forms import LearningGoalForm
 
 
+# goal_list's per-user board cache; LearningGoal/GoalMilestone save/delete signals (core/signals.py)
+# and the queryset .update() paths clear it, the TTL bounds anything else
+GOAL_BOARD_CACHE_SECONDS = 120
+
+# Built once at import instead of per request
+_VALID_STATUS = frozenset(code for code, label in LearningGoal.STATUS_CHOICES)
+_STATUS_LABELS = dict(LearningGoal.STATUS_CHOICES)
+
+
 @login_required
 def goal_list(request):
     """
     Displays the Kanban board view of all user goals, grouped by status.
     This view now serves as the primary Goal Dashboard.
     """
-    # Optimized query: Fetch all goals and prefetch all related milestones
-    goals = LearningGoal.objects.filter(user=request.user).prefetch_related(
-        Prefetch('milestones', queryset=GoalMilestone.objects.order_by('created_at')),
-        # Prefetch related resources used in goal updates, if any
-        Prefetch('updates__resource')
-    )
-
-    # Group goals by status for the Kanban display
-    kanban_columns = {
-        'Not Started': goals.filter(status='N'),
-        'In Progress': goals.filter(status='I'),
-        'Completed': goals.filter(status='C'),
-        'Archived': goals.filter(status='A'),
-    }
+    # The board is cached per user as plain dicts (no pickled model instances): one
+    # values() query for the goals' card columns and one for all their milestones,
+    # grouped in Python. ?refresh=1 bypasses the cache
+    cache_key = LearningGoal.board_cache_key(request.user.pk)
+    goals = None if request.GET.get('refresh') else cache.get(cache_key)
+    if goals is None:
+        goals = list(
+            LearningGoal.objects.filter(user=request.user).values(
+                'id', 'title', 'description', 'status', 'due_date',
+                'milestone_count', 'milestone_completed_count',
+            )
+        )
+        milestones_by_goal = {goal['id']: [] for goal in goals}
+        milestones = GoalMilestone.objects.filter(goal__user=request.user).order_by('created_at').values(
+            'id', 'goal_id', 'title', 'is_completed',
+        )
+        for milestone in milestones:
+            milestone['pk'] = milestone['id']
+            milestones_by_goal[milestone['goal_id']].append(milestone)
+        for goal in goals:
+            goal['pk'] = goal['id']
+            goal['status_display'] = _STATUS_LABELS[goal['status']]
+            # Same rule as LearningGoal.progress_percentage
+            goal['progress_percentage'] = (
+                int(goal['milestone_completed_count'] / goal['milestone_count'] * 100)
+                if goal['milestone_count'] else 0
+            )
+            goal['milestones'] = milestones_by_goal[goal['id']]
+        cache.set(cache_key, goals, GOAL_BOARD_CACHE_SECONDS)
+
+    # Evaluated once and bucketed in Python
+    kanban_columns = {label: [] for code, label in LearningGoal.STATUS_CHOICES}
+    for goal in goals:
+        kanban_columns[goal['status_display']].append(goal)
 
     # Form for adding a new goal (displayed in a modal/sidebar)
     new_goal_form = LearningGoalForm()
 
-    # Calculate basic stats for the goals.html template display
-    total_goals = goals.count()
-    completed_goals = goals.filter(status='C').count()
-    active_goals = goals.filter(status__in=['N', 'I']).count()
-
-    # Simple overdue calculation (goals not completed and past due date)
-    overdue_goals = goals.filter(status__in=['N', 'I'], due_date__lt=timezone.now().date()).count()
+    # Calculate basic stats for the goals.html template display from the loaded goals
+    # (overdue = goals not completed and past due date)
+    today = timezone.now().date()
+    active = kanban_columns['Not Started'] + kanban_columns['In Progress']
+    total_goals = len(goals)
+    completed_goals = len(kanban_columns['Completed'])
+    active_goals = len(active)
+    overdue_goals = sum(1 for goal in active if goal['due_date'] and goal['due_date'] < today)
 
     completion_rate = (completed_goals / total_goals * 100) if total_goals > 0 else 0
 
     context = {
         'kanban_columns': kanban_columns,
-        'goals': goals,  # Pass the entire queryset for flexible template use
+        'goals': goals,  # Pass the entire list for flexible template use
         'new_goal_form': new_goal_form,
         'status_choices': LearningGoal.STATUS_CHOICES,
         'stats': {
@@ -97,16 +129,22 @@ def milestone_toggle(request, milestone_pk):
     Handles AJAX POST to toggle the completion status of a GoalMilestone.
     """
     try:
-        milestone = get_object_or_404(GoalMilestone, pk=milestone_pk, goal__user=request.user)
+        milestone = get_object_or_404(
+            GoalMilestone.objects.select_related('goal'), pk=milestone_pk, goal__user=request.user
+        )
 
         # Toggle the status
         milestone.is_completed = not milestone.is_completed
         # The save method automatically updates the parent goal's counters
         milestone.save()
 
-        # Refresh the parent goal to send back the latest progress data
+        # Mirror the new counters on the already-loaded goal instead of re-reading it
+        # (the toggle moved the completed count by exactly one)
         goal = milestone.goal
-        goal.refresh_from_db()
+        goal.set_progress_counters(
+            goal.milestone_count,
+            goal.milestone_completed_count + (1 if milestone.is_completed else -1),
+        )
 
         return JsonResponse({
             'success': True,
@@ -134,34 +172,33 @@ def goal_update_status(request, goal_pk):
     new_status = request.POST.get('new_status')
 
     # Validate the incoming status code
-    valid_status_codes = [choice[0] for choice in LearningGoal.STATUS_CHOICES]
-    if new_status not in valid_status_codes:
+    if new_status not in _VALID_STATUS:
         return HttpResponseBadRequest('Invalid status code provided.')
 
     try:
-        goal = get_object_or_404(LearningGoal, pk=goal_pk, user=request.user)
-
-        # Only allow status change if it's different
-        if goal.status != new_status:
-            goal.status = new_status
+        # One UPDATE scoped to the owner (no SELECT first). completed_at is stamped when
+        # moving into 'Completed' (kept if it was already completed) and cleared otherwise
+        if new_status == 'C':
+            completed_at = Case(When(status='C', then=F('completed_at')), default=Value(timezone.now()))
+        else:
+            completed_at = None
+        updated = LearningGoal.objects.filter(pk=goal_pk, user=request.user).update(
+            status=new_status,
+            completed_at=completed_at,
+        )
+        if not updated:
+            return JsonResponse({'success': False, 'error': 'Goal not found or unauthorized.'}, status=404)
+
+        # .update() sends no post_save, so the board cache is cleared here
+        LearningGoal.clear_board_cache(request.user.pk)
 
-            # Update completed_at field if status is changing to or from 'Completed'
-            if new_status == 'C':
-                goal.completed_at = timezone.now()
-            elif goal.status != 'C' and goal.completed_at is not None:
-                goal.completed_at = None
-
-            goal.save(update_fields=['status', 'completed_at'])
-
-            return JsonResponse({
-                'success': True,
-                'goal_id': goal.pk,
-                'new_status': goal.get_status_display(),
-                'new_status_code': goal.status,
-            })
+        return JsonResponse({
+            'success': True,
+            'goal_id': goal_pk,
+            'new_status': _STATUS_LABELS[new_status],
+            'new_status_code': new_status,
+        })
 
-    except LearningGoal.DoesNotExist:
-        return JsonResponse({'success': False, 'error': 'Goal not found or unauthorized.'}, status=404)
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
@@ -1,5 +1,11 @@
 from django.contrib import admin
-from django.db.models import F
+from collections import defaultdict
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from core.services import category_resources_changed
 from .models import Tag, BaseResource, Book, Article, Course, UserResourceInteraction, Comment, CourseProgress
 
 
@@ -8,13 +14,19 @@ from .models import Tag, BaseResource, Book, Article, Course, UserResourceIntera
 @admin.action(description='Mark selected resources as approved')
 def make_approved(modeladmin, request, queryset):
     """Admin action to set the is_approved field to True for selected resources."""
+    # read first: the changelist's filters (e.g. is_approved) may no longer match after the update
+    category_ids = set(queryset.values_list('category_id', flat=True))
     queryset.update(is_approved=True)
+    category_resources_changed(category_ids)
 
 
 @admin.action(description='Mark selected resources as UNapproved (Draft)')
 def make_unapproved(modeladmin, request, queryset):
     """Admin action to set the is_approved field to False for selected resources."""
+    # read first: the changelist's filters (e.g. is_approved) may no longer match after the update
+    category_ids = set(queryset.values_list('category_id', flat=True))
     queryset.update(is_approved=False)
+    category_resources_changed(category_ids)
 
 
 # --- 2. Base Admin Class for Shared Functionality ---
@@ -44,7 +56,7 @@ class BaseResourceAdmin(admin.ModelAdmin):
     list_filter = ('is_approved', 'difficulty', 'category', 'created_at')
 
     # Search fields (searching across all common attributes)
-    search_fields = ('title', 'description', 'author__username', 'tags__name')
+    search_fields = ('title', 'description', 'author__email', 'tags__name')
 
     # Custom actions (defined above)
     actions = [make_approved, make_unapproved]
@@ -69,8 +81,37 @@ class BaseResourceAdmin(admin.ModelAdmin):
         """Returns True/False (with green/red icon) based on the is_approved field."""
         return obj.is_approved
 
+    def changelist_view(self, request, extra_context=None):
+        """
+        Saving the list_editable column normally costs one UPDATE per changed row.
+        save_model only collects the is_approved changes here; they are written
+        as one UPDATE per value before the changelist's transaction ends. .update()
+        sends no post_save, so the category counts and home cache are refreshed here.
+        """
+        if request.method != 'POST' or '_save' not in request.POST:
+            return super().changelist_view(request, extra_context)
+
+        request._approval_changes = {True: [], False: []}
+        with transaction.atomic():
+            response = super().changelist_view(request, extra_context)
+            changed = [pk for pks in request._approval_changes.values() for pk in pks]
+            for is_approved, pks in request._approval_changes.items():
+                if pks:
+                    self.model.objects.filter(pk__in=pks).update(
+                        is_approved=is_approved, updated_at=timezone.now()
+                    )
+            if changed:
+                category_resources_changed(
+                    self.model.objects.filter(pk__in=changed).values_list('category_id', flat=True)
+                )
+        return response
+
     def save_model(self, request, obj, form, change):
         """Set the author automatically if the instance is new and the author field is empty."""
+        approval_changes = getattr(request, '_approval_changes', None)
+        if approval_changes is not None and change and form.changed_data == ['is_approved']:
+            approval_changes[obj.is_approved].append(obj.pk)
+            return
         if not obj.author_id:
             obj.author = request.user
         super().save_model(request, obj, form, change)
@@ -138,42 +179,66 @@ class TagAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('content', 'resource', 'author', 'created_at')
     list_filter = ('created_at', 'resource')
-    search_fields = ('content', 'author__username', 'resource__title')
+    search_fields = ('content', 'author__email', 'resource__title')
     raw_id_fields = ('author',  'parent')  # Use raw ID for large relationships
 
+    def get_queryset(self, request):
+        # author is a FK (joined); resource is a generic FK, prefetched with one query per resource type
+        return super().get_queryset(request).select_related('author').prefetch_related('resource')
+
 
 @admin.register(UserResourceInteraction)
 class InteractionAdmin(admin.ModelAdmin):
     list_display = ('user', 'resource', 'upvoted', 'saved', 'completed', 'created_at')
     list_filter = ('upvoted', 'saved', 'completed')
-    search_fields = ('user__username', 'resource__title')
+    search_fields = ('user__email', 'resource__title')
     raw_id_fields = ('user', )
 
+    def get_queryset(self, request):
+        # user is a FK (joined); resource is a generic FK, prefetched with one query per resource type
+        return super().get_queryset(request).select_related('user').prefetch_related('resource')
+
     # Action to recalculate resource counts if necessary
     actions = ['recalculate_resource_counts']
 
     @admin.action(description='Recalculate cached resource counts')
     def recalculate_resource_counts(self, request, queryset):
-        """Recalculates the cached upvote/saved counts on the BaseResource model."""
-
-        # Group interactions by resource and count the totals
-        resource_counts = queryset.values('resource').annotate(
-            total_upvotes=F('resource__upvote_count'),
-            total_saved=F('resource__saved_count')
-        )
-
-        # NOTE: For a proper recount, you should iterate over ALL interactions for each resource
-        # rather than just the selected queryset. This is a simplified action.
-
-        # A more robust solution would be to trigger a signal/task that recounts ALL interactions
-        # for the affected resource IDs.
-
-        self.message_user(request, "Resource counts scheduled for recalculation.", level='warning')
+        """
+        Recounts upvote_count/saved_count from ALL interactions of every resource
+        touched by the selection: one UPDATE per resource type (correlated COUNT
+        subqueries), whatever the selection size.
+        """
+        resource_ids = defaultdict(set)
+        for content_type_id, object_id in queryset.values_list('content_type', 'object_id').distinct():
+            resource_ids[content_type_id].add(object_id)
+
+        def count_of(interactions):
+            return Coalesce(
+                Subquery(interactions.values('object_id').annotate(c=Count('pk')).values('c')),
+                0,
+            )
+
+        updated = 0
+        for model in (Book, Article, Course):
+            content_type = ContentType.objects.get_for_model(model)  # cached by ContentType
+            ids = resource_ids.get(content_type.pk)
+            if not ids:
+                continue
+            interactions = UserResourceInteraction.objects.filter(
+                content_type=content_type,
+                object_id=OuterRef('pk'),
+            ).order_by()
+            updated += model.objects.filter(pk__in=ids).update(
+                upvote_count=count_of(interactions.filter(upvoted=True)),
+                saved_count=count_of(interactions.filter(saved=True)),
+            )
+
+        self.message_user(request, f"Recalculated counts for {updated} resource(s).")
 
 
 @admin.register(CourseProgress)
 class CourseProgressAdmin(admin.ModelAdmin):
     list_display = ('user', 'course', 'current_step', 'completed', 'last_accessed')
     list_filter = ('completed',)
-    search_fields = ('user__username', 'course__title')
+    search_fields = ('user__email', 'course__title')
     raw_id_fields = ('user', 'course')
\ No newline at end of file
@@ -1,11 +1,19 @@
 import os
+import re
 import json
-import isodate  # Required for parsing YouTube durations
+import hashlib
+import functools
+import logging
+import httplib2
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from openai import OpenAI, OpenAIError, RateLimitError
 from googleapiclient.discovery import build  # Standard YouTube API client
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
+logger = logging.getLogger(__name__)
+
 # 1. Initialize Clients
 DEEPSEEK_API_KEY = os.environ.get('DEEPSEEK_API_KEY')
 YOUTUBE_API_KEY = os.environ.get('YOUTUBE_API_KEY')
@@ -16,14 +24,90 @@ deepseek_client = OpenAI(
     base_url="https://api.deepseek.com"
 )
 
-# Initialize YouTube Service
-youtube = build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
 
+# Initialize YouTube Service (lazily)
+@functools.lru_cache(maxsize=None)
+def _youtube_client():
+    """
+    YouTube service, built on first use so importing this module (or running
+    without YOUTUBE_API_KEY) doesn't construct a client
+    """
+    return build('youtube', 'v3', developerKey=YOUTUBE_API_KEY)
+
+
+# Modules whose YouTube lookups run at once (the prompt asks for 4-6 modules)
+YOUTUBE_MAX_WORKERS = 6
+# videos.list accepts at most 50 IDs per request
+YOUTUBE_VIDEOS_PER_REQUEST = 50
+
+# Successful DeepSeek/YouTube responses are cached for a day: the same prompt or
+# search query gives the same answer, so regenerations skip the remote calls
+COURSE_TOOLS_CACHE_SECONDS = 60 * 60 * 24
+
+
+def _cache_key(kind, value):
+    """
+    Cache key for a remote call: SHA-256 of the input so long prompts stay valid keys
+    """
+    return f'course_tools:{kind}:{hashlib.sha256(value.encode()).hexdigest()}'
+
+
+class _ModuleStreamParser:
+    """
+    Picks complete objects out of the "modules" array of a JSON reply that is still
+    streaming in, so work on a module can start before the rest is generated.
+    The stdlib decoder's raw_decode does the parsing; an object that is cut off
+    mid-chunk just fails to decode until more text arrives.
+    """
+    _decoder = json.JSONDecoder()
+    _modules_re = re.compile(r'"modules"\s*:\s*\[')
+    _title_re = re.compile(r'"improved_title"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+    def __init__(self, on_module):
+        self.on_module = on_module
+        self.buffer = ''
+        self.position = None  # index inside the modules array, once it has started
+        self.improved_title = None
+
+    def feed(self, text):
+        self.buffer += text
+        if self.position is None:
+            match = self._modules_re.search(self.buffer)
+            if not match:
+                return
+            self.position = match.end()
+            # The schema puts improved_title before modules
+            title = self._title_re.search(self.buffer, 0, match.start())
+            if title:
+                self.improved_title = json.loads(title.group(1))
+
+        while True:
+            index = self.position
+            while index < len(self.buffer) and self.buffer[index] in ' \t\r\n,':
+                index += 1
+            self.position = index
+            if index >= len(self.buffer) or self.buffer[index] == ']':
+                return
+            try:
+                module, self.position = self._decoder.raw_decode(self.buffer, index)
+            except json.JSONDecodeError:
+                return  # incomplete: wait for the next chunk
+            if isinstance(module, dict) and module.get('title'):
+                self.on_module(module, self.improved_title)
 
-def _call_deepseek_api(prompt: str):
+
+def _call_deepseek_api(prompt: str, on_module=None):
     """
     Call DeepSeek API with proper JSON response formatting
+
+    The completion is streamed; on_module(module, improved_title) is called for each
+    module as soon as it has fully arrived (not at all on a cache hit).
     """
+    cache_key = _cache_key('deepseek', prompt)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         response = deepseek_client.chat.completions.create(
             model="deepseek-chat",  # Use "deepseek-coder" if course is programming-related
@@ -39,11 +123,24 @@ def _call_deepseek_api(prompt: str):
             ],
             response_format={"type": "json_object"},
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            stream=True,
         )
 
-        content = response.choices[0].message.content
-        return json.loads(content)
+        parts = []
+        parser = _ModuleStreamParser(on_module) if on_module else None
+        for chunk in response:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if not text:
+                continue
+            parts.append(text)
+            if parser:
+                parser.feed(text)
+
+        data = json.loads(''.join(parts))
+        # Only real answers are cached; the fallbacks below should be retried
+        cache.set(cache_key, data, COURSE_TOOLS_CACHE_SECONDS)
+        return data
 
     except RateLimitError:
         return {
@@ -53,14 +150,14 @@ def _call_deepseek_api(prompt: str):
         }
     except json.JSONDecodeError as e:
         # Fallback in case AI doesn't return valid JSON
-        print(f"JSON parsing error: {e}")
+        logger.warning(f"JSON parsing error: {e}")
         return {
             "improved_title": "Course Title",
             "enriched_description": "Course Description",
             "modules": []
         }
     except OpenAIError as e:
-        print(f"DeepSeek API Error: {e}")
+        logger.error(f"DeepSeek API Error: {e}")
         raise e
 
 
@@ -85,20 +182,28 @@ def _construct_search_query(course_title: str, module_title: str) -> str:
     return query[:100]  # YouTube API limit for query length
 
 
-def _fetch_youtube_content(course_title: str, module_title: str):
+def _search_youtube_video_ids(course_title: str, module_title: str):
     """
-    Enhanced YouTube API implementation with better search parameters
+    Enhanced YouTube search with better search parameters; returns candidate video IDs
     """
     try:
         # Construct optimized search query
         search_query = _construct_search_query(course_title, module_title)
 
-        print(f"Searching YouTube for: {search_query}")  # Debug logging
+        cache_key = _cache_key('youtube_search', search_query)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        logger.debug(f"Searching YouTube for: {search_query}")
+
+        # httplib2 connections aren't thread-safe: give each call its own
+        http = httplib2.Http()
 
         # 1. Search for video IDs with optimized parameters
-        search_response = youtube.search().list(
+        search_response = _youtube_client().search().list(
             q=search_query,
-            part='snippet',
+            part='id',  # titles/channels come from videos.list, so the search needs IDs only
             maxResults=5,  # Get more results to filter later
             type='video',
             videoEmbeddable='true',
@@ -107,72 +212,133 @@ def _fetch_youtube_content(course_title: str, module_title: str):
             order='relevance',  # Most relevant first
             safeSearch='moderate',  # Filter out inappropriate content
             videoDefinition='high',  # Prefer HD videos
-            fields='items(id(videoId),snippet(title,channelTitle))'  # Limit response size
-        ).execute()
+            fields='items(id/videoId)'  # Limit response size
+        ).execute(http=http)
 
         video_items = search_response.get('items', [])
         if not video_items:
-            print(f"No videos found for query: {search_query}")
-            return []
+            logger.info(f"No videos found for query: {search_query}")
 
         # Extract video IDs
         video_ids = [item['id']['videoId'] for item in video_items if item['id'].get('videoId')]
+        cache.set(cache_key, video_ids, COURSE_TOOLS_CACHE_SECONDS)
+        return video_ids
 
-        if not video_ids:
-            return []
+    except Exception as e:
+        logger.error(f"YouTube API Error: {e}")
+        # Return empty list to prevent breaking the flow
+        return []
 
-        # 2. Get detailed metadata including duration and statistics
-        video_details = youtube.videos().list(
-            id=','.join(video_ids),
-            part='contentDetails,snippet,statistics',
-            fields='items(id,snippet(title,channelTitle),contentDetails(duration),statistics(viewCount))'
-        ).execute()
 
-        results = []
-        for item in video_details.get('items', []):
-            try:
-                # Parse ISO 8601 duration
-                dur_raw = item['contentDetails']['duration']
-                dur_seconds = int(isodate.parse_duration(dur_raw).total_seconds())
-
-                # Filter for educational content: 2 to 60 minutes
-                if not (120 <= dur_seconds <= 3600):
-                    continue
-
-                # Format duration for display
-                minutes, seconds = divmod(dur_seconds, 60)
-                duration_str = f"{minutes} min {seconds} sec" if seconds > 0 else f"{minutes} min"
-
-                # Get view count for quality filtering
-                view_count = int(item['statistics'].get('viewCount', 0))
-
-                # Calculate quality score (simplified)
-                quality_score = view_count / 1000  # Simple heuristic
-
-                results.append({
-                    'title': item['snippet']['title'][:100],  # Truncate long titles
-                    'url': f"https://www.youtube.com/embed/{item['id']}",
-                    'watch_url': f"https://www.youtube.com/watch?v={item['id']}",
-                    'duration': duration_str,
-                    'duration_seconds': dur_seconds,
-                    'channel': item['snippet'].get('channelTitle', 'Unknown'),
-                    'views': view_count,
-                    'quality_score': quality_score
-                })
-            except (KeyError, ValueError) as e:
-                print(f"Skipping video due to parsing error: {e}")
+def _fetch_video_details(video_ids):
+    """
+    Detailed metadata (duration, statistics) for any number of videos, keyed by video ID.
+    videos.list takes up to 50 IDs per call, so modules share calls instead of one each.
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    # Per-video cache entries, so modules sharing a video (or a regeneration) reuse it
+    cache_keys = {video_id: _cache_key('youtube_video', video_id) for video_id in video_ids}
+    cached = cache.get_many(cache_keys.values())
+    details = {
+        video_id: cached[key] for video_id, key in cache_keys.items() if key in cached
+    }
+    missing_ids = [video_id for video_id in video_ids if video_id not in details]
+    try:
+        for start in range(0, len(missing_ids), YOUTUBE_VIDEOS_PER_REQUEST):
+            batch = missing_ids[start:start + YOUTUBE_VIDEOS_PER_REQUEST]
+            # 2. Get detailed metadata including duration and statistics
+            video_details = _youtube_client().videos().list(
+                id=','.join(batch),
+                part='contentDetails,snippet,statistics',
+                fields='items(id,snippet(title,channelTitle),contentDetails(duration),statistics(viewCount))'
+            ).execute(http=httplib2.Http())
+            fetched = {item['id']: item for item in video_details.get('items', [])}
+            cache.set_many(
+                {cache_keys[video_id]: item for video_id, item in fetched.items() if video_id in cache_keys},
+                COURSE_TOOLS_CACHE_SECONDS,
+            )
+            details.update(fetched)
+    except Exception as e:
+        logger.error(f"YouTube API Error: {e}")
+    return details
+
+
+# Seconds per designator in a YouTube duration ("P[nD]T[nH][nM][nS]")
+_DURATION_UNITS = {'D': 86400, 'H': 3600, 'M': 60, 'S': 1}
+
+
+def _parse_youtube_duration(value: str) -> int:
+    """
+    Whole seconds in a YouTube contentDetails.duration, e.g. PT1H2M3S -> 3723.
+    YouTube only emits this integer day/hour/minute/second form, so one pass over
+    the string replaces a general ISO 8601 parser; anything else raises ValueError.
+    """
+    if not value.startswith('P'):
+        raise ValueError(f'Invalid duration: {value!r}')
+    total = 0
+    number = ''
+    for char in value[1:]:
+        if char.isdigit():
+            number += char
+        elif char == 'T' and not number:
+            continue
+        elif char in _DURATION_UNITS and number:
+            total += int(number) * _DURATION_UNITS[char]
+            number = ''
+        else:
+            raise ValueError(f'Invalid duration: {value!r}')
+    if number:
+        raise ValueError(f'Invalid duration: {value!r}')
+    return total
+
+
+def _build_module_videos(video_ids, details):
+    """
+    Filter, format and rank one module's videos from the fetched metadata
+    """
+    results = []
+    for video_id in video_ids:
+        item = details.get(video_id)
+        if item is None:
+            continue
+        try:
+            # Parse ISO 8601 duration
+            dur_raw = item['contentDetails']['duration']
+            dur_seconds = _parse_youtube_duration(dur_raw)
+
+            # Filter for educational content: 2 to 60 minutes
+            if not (120 <= dur_seconds <= 3600):
                 continue
 
-        # Sort by quality score (views) and duration relevance
-        results.sort(key=lambda x: x['quality_score'], reverse=True)
+            # Format duration for display
+            minutes, seconds = divmod(dur_seconds, 60)
+            duration_str = f"{minutes} min {seconds} sec" if seconds > 0 else f"{minutes} min"
 
-        # Return top 2-3 most relevant videos
-        return results[:3]
+            # Get view count for quality filtering
+            view_count = int(item['statistics'].get('viewCount', 0))
 
-    except Exception as e:
-        print(f"YouTube API Error: {e}")
-        # Return empty list to prevent breaking the flow
-        return []
+            # Calculate quality score (simplified)
+            quality_score = view_count / 1000  # Simple heuristic
+
+            results.append({
+                'title': item['snippet']['title'][:100],  # Truncate long titles
+                'url': f"https://www.youtube.com/embed/{item['id']}",
+                'watch_url': f"https://www.youtube.com/watch?v={item['id']}",
+                'duration': duration_str,
+                'duration_seconds': dur_seconds,
+                'channel': item['snippet'].get('channelTitle', 'Unknown'),
+                'views': view_count,
+                'quality_score': quality_score
+            })
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping video due to parsing error: {e}")
+            continue
+
+    # Sort by quality score (views) and duration relevance
+    results.sort(key=lambda x: x['quality_score'], reverse=True)
+
+    # Return top 2-3 most relevant videos
+    return results[:3]
 
 
 def generate_course_roadmap(course):
@@ -208,20 +374,43 @@ def generate_course_roadmap(course):
     5. The description should be detailed and informative
     """
 
-    # Get AI-generated course structure
-    ai_raw_data = _call_deepseek_api(prompt)
-
     total_seconds = 0
     structured_modules = []
 
-    # Process each module and fetch relevant YouTube videos
-    for module_data in ai_raw_data.get('modules', []):
-        # Fetch relevant YouTube videos for this module
-        videos = _fetch_youtube_content(
-            course_title=ai_raw_data.get('improved_title', course.title),
-            module_title=module_data['title']
-        )
-
+    # Search YouTube for every module concurrently: each search is network-bound,
+    # so the wait is the slowest module rather than the sum. Searches start while
+    # DeepSeek is still streaming, as each module arrives.
+    searches = {}
+    with ThreadPoolExecutor(max_workers=YOUTUBE_MAX_WORKERS) as executor:
+        def start_search(module_data, improved_title):
+            search_title = improved_title or course.title
+            searches[(search_title, module_data['title'])] = executor.submit(
+                _search_youtube_video_ids, search_title, module_data['title']
+            )
+
+        # Get AI-generated course structure (without a YouTube key there is nothing to search)
+        ai_raw_data = _call_deepseek_api(prompt, on_module=start_search if YOUTUBE_API_KEY else None)
+
+        # Modules not started during the stream (cache hit, or the title it guessed
+        # differs from the final one) are searched now
+        modules = ai_raw_data.get('modules', [])
+        course_title = ai_raw_data.get('improved_title', course.title)
+        if YOUTUBE_API_KEY:
+            for module_data in modules:
+                if (course_title, module_data['title']) not in searches:
+                    start_search(module_data, course_title)
+            module_video_ids = [searches[(course_title, module_data['title'])].result() for module_data in modules]
+
+    if YOUTUBE_API_KEY:
+        # Then one videos.list for all modules' candidates (N + 1 calls instead of 2N)
+        details = _fetch_video_details([video_id for ids in module_video_ids for video_id in ids])
+        module_videos = [_build_module_videos(ids, details) for ids in module_video_ids]
+    else:
+        # No key: every YouTube call would just fail with 403, so skip straight to the fallback
+        module_videos = [get_fallback_videos(module_data['title']) for module_data in modules]
+
+    # Process each module with its videos
+    for module_data, videos in zip(modules, module_videos):
         # Calculate module duration
         module_seconds = sum(v['duration_seconds'] for v in videos)
 
@@ -234,10 +423,11 @@ def generate_course_roadmap(course):
         structured_modules.append(module_data)
 
     # Update course model
-    course.title = ai_raw_data.get('improved_title', course.title)
+    course.title = course_title
     course.description = ai_raw_data.get('enriched_description', course.description)
     course.estimated_duration = timedelta(seconds=total_seconds)
-    course.roadmap_json = json.dumps(structured_modules, indent=2)
+    # Compact JSON: roadmap_json is a TextField read back with json.loads, not by people
+    course.roadmap_json = json.dumps(structured_modules, separators=(',', ':'))
     course.save()
 
     return structured_modules
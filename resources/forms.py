@@ -1,6 +1,47 @@
+import re
 from django import forms
-from .models import Book, Article, Course, Tag
+from django.db.models import Q
+from django.template.defaultfilters import slugify
+from django.utils.functional import cached_property
+from .models import BaseResource, Book, Article, Course, Tag
 from core.models import Category
+from core.services import get_category_choices
+
+
+# Separator for the comma-separated tags input
+_TAG_SPLIT = re.compile(r'\s*,\s*')
+_TAG_MAX_LENGTH = Tag._meta.get_field('name').max_length
+_TAG_SLUG_MAX_LENGTH = Tag._meta.get_field('slug').max_length
+
+
+# Widget attrs for the resource forms' Meta.widgets
+INPUT_ATTRS = {
+    'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-transparent',
+}
+TITLE_ATTRS = {**INPUT_ATTRS, 'placeholder': 'Resource Title'}
+DESCRIPTION_ATTRS = {**INPUT_ATTRS, 'rows': 4, 'placeholder': 'Describe the resource'}
+TAGS_ATTRS = {**INPUT_ATTRS, 'placeholder': 'Add tags separated by commas'}
+HIDDEN_ATTRS = {'class': 'hidden'}
+# Type-specific fields (file, pages, content, ...) use the plain bordered style
+DETAIL_INPUT_ATTRS = {'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg'}
+PAGES_ATTRS = {**DETAIL_INPUT_ATTRS, 'placeholder': 'Number of pages (optional)'}
+CONTENT_ATTRS = {**DETAIL_INPUT_ATTRS, 'rows': 8, 'placeholder': 'Write your article content here'}
+DURATION_ATTRS = {**DETAIL_INPUT_ATTRS, 'placeholder': 'e.g., 7 days'}
+
+# Difficulty radio-button cards (icon + description per level), built once at import
+_DIFFICULTY_META = {
+    'B': ('🟢', 'No prior experience needed'),
+    'I': ('🟡', 'Some basic knowledge required'),
+    'A': ('🔴', 'For experienced developers'),
+}
+_DIFFICULTY_CHOICES = [
+    {
+        'value': value,
+        'label': f"{_DIFFICULTY_META.get(value, ('', ''))[0]} {label}",
+        'description': _DIFFICULTY_META.get(value, ('', ''))[1],
+    }
+    for value, label in BaseResource.DIFFICULTY_CHOICES
+]
 
 
 class TagsMixin:
@@ -10,57 +51,64 @@ class TagsMixin:
         """Initialize the form and handle initial tags data."""
         instance = kwargs.get('instance')
 
-        # 1. PRE-POPULATE INITIAL TAGS (for Edit Mode)
+        # 1. PRE-POPULATE INITIAL TAGS (for Edit Mode); new forms use the field's initial=''
         if instance and instance.pk:
             initial = kwargs.setdefault('initial', {})
 
-            # Check if tags relationship is available before querying
-            try:
-                tags = instance.tags.all()
-                tag_names = ','.join(tag.name for tag in tags)
-                initial['tags_string'] = tag_names
-            except Exception as e:
-                # Log or handle gracefully
-                print(f"Warning: Could not set initial tags for instance: {e}")
-                initial['tags_string'] = ''
-        else:
-            # Ensure initial dict exists for new instances
-            kwargs.setdefault('initial', {})
-            kwargs['initial'].setdefault('tags_string', '')
+            # Just the names (no Tag instances) for the comma-separated input
+            initial['tags_string'] = ','.join(instance.tags.values_list('name', flat=True))
 
         # 2. Call super().__init__ to finalize form construction
-
         super().__init__(*args, **kwargs)
 
-
-
-        # 3. Now that the form is initialized, we can safely customize the widget
-        if 'tags_string' in self.fields:
-            common_attrs = {
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-transparent',
-                'placeholder': 'Add tags separated by commas'
-            }
-            self.fields['tags_string'].widget.attrs.update(common_attrs)
-
-
     def clean_tags_string(self):
         """Cleans and validates the tags input."""
         tags_input = self.cleaned_data.get('tags_string', '')
-        tags_list = tags_input.split(',')
-        cleaned_tags = {
-            tag.strip().lower() for tag in tags_list if tag.strip()
+        # One split (whitespace around the commas included) and one lower() for the
+        # whole input; names are capped at Tag.name's length
+        return {
+            tag[:_TAG_MAX_LENGTH] for tag in _TAG_SPLIT.split(tags_input.strip().lower()) if tag
         }
-        return cleaned_tags
 
     def save_tags(self, resource_instance):
-        """Finds or creates tags and sets them on the resource instance."""
+        """
+        Finds or creates tags and sets them on the resource instance.
+        A constant number of queries (instead of a get_or_create per tag): look up the
+        existing tags by name or slug, insert the genuinely new ones in one statement,
+        re-read their ids.
+
+        Tag.slug is unique too, and different names can share a slug ("c++" and "c",
+        or long names with the same first 50 characters): such a name is attached to
+        the tag that already owns the slug instead of being inserted (and dropped).
+        """
         cleaned_tags = self.cleaned_data.get('tags_string')
-        if cleaned_tags is not None:
-            tag_objects = []
-            for tag_name in cleaned_tags:
-                tag_obj, created = Tag.objects.get_or_create(name=tag_name)
-                tag_objects.append(tag_obj)
-            resource_instance.tags.set(tag_objects)
+        if cleaned_tags is None:
+            return
+
+        slugs = {name: slugify(name)[:_TAG_SLUG_MAX_LENGTH] for name in cleaned_tags}
+        existing = Tag.objects.filter(
+            Q(name__in=cleaned_tags) | Q(slug__in=slugs.values())
+        ).values_list('id', 'name', 'slug')
+        id_by_name, id_by_slug = {}, {}
+        for tag_id, name, slug in existing:
+            id_by_name[name] = id_by_slug[slug] = tag_id
+
+        # One new row per free slug (two new names may share one, too)
+        new_tags = {}
+        for name, slug in slugs.items():
+            if name not in id_by_name and slug not in id_by_slug:
+                new_tags.setdefault(slug, name)
+        if new_tags:
+            # bulk_create skips Tag.save(), so the slug is set here the same way;
+            # ignore_conflicts: a concurrent save may have created the same tag
+            Tag.objects.bulk_create(
+                [Tag(name=name, slug=slug) for slug, name in new_tags.items()],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+            id_by_slug.update(Tag.objects.filter(slug__in=new_tags).values_list('slug', 'id'))
+
+        resource_instance.tags.set({id_by_name.get(name) or id_by_slug[slug] for name, slug in slugs.items()})
 
 
 class BaseResourceForm(TagsMixin, forms.ModelForm):
@@ -71,6 +119,8 @@ class BaseResourceForm(TagsMixin, forms.ModelForm):
         required=False,
         label='Tags (Comma Separated)',
         help_text='Add relevant tags to help others find your resource',
+        initial='',
+        widget=forms.TextInput(attrs=TAGS_ATTRS),
     )
 
     class Meta:
@@ -78,75 +128,36 @@ class BaseResourceForm(TagsMixin, forms.ModelForm):
         model = None
         fields = ['title', 'description', 'category', 'difficulty', 'url']
         exclude = ['tags']
+        # Declared once with the form class; subclasses extend this dict in their Meta
+        widgets = {
+            'title': forms.TextInput(attrs=TITLE_ATTRS),
+            'description': forms.Textarea(attrs=DESCRIPTION_ATTRS),
+            'category': forms.Select(attrs=INPUT_ATTRS),
+            'difficulty': forms.Select(attrs=HIDDEN_ATTRS),
+        }
 
     def __init__(self, *args, **kwargs):
         # Call TagsMixin.__init__ first, then forms.ModelForm.__init__
         super().__init__(*args, **kwargs)
 
-        #Apply widgets to fields that exist
-        #... (title, description, category, difficulty widget updates remain the same) ...
-
-        common_attrs = {
-            'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-transparent',
-        }
-
-        # Apply widgets to fields that exist
-        if 'title' in self.fields:
-            self.fields['title'].widget.attrs.update({
-                **common_attrs,
-                'placeholder': 'Resource Title'
-            })
-
-        if 'description' in self.fields:
-            self.fields['description'].widget.attrs.update({
-                **common_attrs,
-                'rows': 4,
-                'placeholder': 'Describe the resource'
-            })
-        # --- ADD the tags_string widget application here in BaseResourceForm: ---
-        if 'tags_string' in self.fields:
-            common_attrs = {
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-transparent',
-                'placeholder': 'Add tags separated by commas'
-            }
-            # Use update for consistency
-            self.fields['tags_string'].widget.attrs.update(common_attrs)
-
+        # Only the per-instance setup stays here; static widget attrs live in Meta.widgets
         if 'category' in self.fields:
-            self.fields['category'].widget.attrs.update(common_attrs)
-            self.fields['category'].queryset = Category.objects.all()
-            self.fields['category'].empty_label = "Select a category"
-
-        if 'difficulty' in self.fields:
-            self.fields['difficulty'].widget.attrs.update({'class': 'hidden'})
-
-        # Custom attribute for difficulty choices
-        self.difficulty_choices = self._get_difficulty_choices()
-
-    def _get_difficulty_choices(self):
-        """Helper to format difficulty choices for radio buttons in the template."""
-        choices = []
-        if 'difficulty' in self.fields:
-            for value, label in self.fields['difficulty'].choices:
-                if value:  # Skip empty choice
-                    icon = {'B': '🟢', 'I': '🟡', 'A': '🔴'}.get(value, '')
-                    description = {
-                        'B': 'No prior experience needed',
-                        'I': 'Some basic knowledge required',
-                        'A': 'For experienced developers'
-                    }.get(value, '')
-
-                    # Check if this choice is selected
-                    current_value = self.initial.get('difficulty', '')
-                    is_selected = str(value) == str(current_value)
-
-                    choices.append({
-                        'value': value,
-                        'label': f"{icon} {label}",
-                        'description': description,
-                        'selected': is_selected
-                    })
-        return choices
+            # Render from the cached (id, name) pairs; the field's queryset is only
+            # queried to validate a submitted value, which needs just the pk/name
+            self.fields['category'].queryset = Category.objects.only('id', 'name')
+            self.fields['category'].choices = [('', 'Select a category'), *get_category_choices()]
+
+    @cached_property
+    def difficulty_choices(self):
+        """Difficulty choices formatted for radio buttons, built on first template access."""
+        if 'difficulty' not in self.fields:
+            return []
+        # Check which choice is selected; the rest comes prebuilt
+        current_value = str(self.initial.get('difficulty', ''))
+        return [
+            {**choice, 'selected': choice['value'] == current_value}
+            for choice in _DIFFICULTY_CHOICES
+        ]
 
     def save(self, commit=True):
         """Handles saving the resource and its tags."""
@@ -160,6 +171,16 @@ class BaseResourceForm(TagsMixin, forms.ModelForm):
 
             # Save other M2M if needed
             self.save_m2m()
+        else:
+            # The views save with commit=False and call save_m2m() once the resource
+            # has a pk: save the tags at that point too
+            save_m2m = self.save_m2m
+
+            def save_m2m_and_tags():
+                save_m2m()
+                self.save_tags(resource)
+
+            self.save_m2m = save_m2m_and_tags
 
         return resource
 
@@ -169,56 +190,29 @@ class BookForm(BaseResourceForm):
     class Meta(BaseResourceForm.Meta):
         model = Book
         fields = BaseResourceForm.Meta.fields + ['file', 'pages']
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Apply book-specific widgets
-        if 'file' in self.fields:
-            self.fields['file'].widget.attrs.update({
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg'
-            })
-
-        if 'pages' in self.fields:
-            self.fields['pages'].widget.attrs.update({
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg',
-                'placeholder': 'Number of pages (optional)'
-            })
+        widgets = {
+            **BaseResourceForm.Meta.widgets,
+            'file': forms.ClearableFileInput(attrs=DETAIL_INPUT_ATTRS),
+            'pages': forms.NumberInput(attrs=PAGES_ATTRS),
+        }
 
 
 class ArticleForm(BaseResourceForm):
     class Meta(BaseResourceForm.Meta):
         model = Article
         fields = BaseResourceForm.Meta.fields + ['content', 'banner_image']
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Apply article-specific widgets
-        if 'content' in self.fields:
-            self.fields['content'].widget.attrs.update({
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg',
-                'rows': 8,
-                'placeholder': 'Write your article content here'
-            })
-
-        if 'banner_image' in self.fields:
-            self.fields['banner_image'].widget.attrs.update({
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg'
-            })
+        widgets = {
+            **BaseResourceForm.Meta.widgets,
+            'content': forms.Textarea(attrs=CONTENT_ATTRS),
+            'banner_image': forms.ClearableFileInput(attrs=DETAIL_INPUT_ATTRS),
+        }
 
 
 class CourseForm(BaseResourceForm):
     class Meta(BaseResourceForm.Meta):
         model = Course
         fields = BaseResourceForm.Meta.fields + ['estimated_duration']
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        # Apply course-specific widgets
-        if 'estimated_duration' in self.fields:
-            self.fields['estimated_duration'].widget.attrs.update({
-                'class': 'w-full px-4 py-3 border border-gray-300 rounded-lg',
-                'placeholder': 'e.g., 7 days'
-            })
\ No newline at end of file
+        widgets = {
+            **BaseResourceForm.Meta.widgets,
+            'estimated_duration': forms.TextInput(attrs=DURATION_ATTRS),
+        }
\ No newline at end of file
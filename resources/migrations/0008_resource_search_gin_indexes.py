@@ -0,0 +1,41 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+# GIN indexes over the same tsvector expression unified_search filters on
+# (resources.models.resource_search_vector). PostgreSQL-only; no-op elsewhere.
+INDEXES = {
+    'book': 'book_search_gin_idx',
+    'article': 'article_search_gin_idx',
+    'course': 'course_search_gin_idx',
+}
+
+
+def _index(name):
+    return GinIndex(SearchVector('title', 'description', config='english'), name=name)
+
+
+def add_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index_name in INDEXES.items():
+        schema_editor.add_index(apps.get_model('resources', model_name), _index(index_name))
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, index_name in INDEXES.items():
+        schema_editor.remove_index(apps.get_model('resources', model_name), _index(index_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0007_author_approved_created_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
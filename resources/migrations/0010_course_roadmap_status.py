@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+def mark_existing_roadmaps_ready(apps, schema_editor):
+    Course = apps.get_model('resources', 'Course')
+    Course.objects.exclude(roadmap_json__isnull=True).exclude(roadmap_json='').update(roadmap_status='R')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0009_author_recent_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='roadmap_status',
+            field=models.CharField(choices=[('N', 'Not Generated'), ('P', 'Generating'), ('R', 'Ready'), ('F', 'Failed')], default='N', editable=False, max_length=1),
+        ),
+        migrations.RunPython(mark_existing_roadmaps_ready, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('resources', '0011_approved_category_recent_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_type', 'object_id', '-created_at'], name='comment_resource_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userresourceinteraction',
+            index=models.Index(fields=['content_type', 'object_id'], name='interaction_resource_idx'),
+        ),
+    ]
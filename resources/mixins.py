@@ -1,34 +1,37 @@
 from django.shortcuts import get_object_or_404
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
+from django.http import Http404
 from .models import BaseResource, Book, Article, Course
 
-def get_concrete_resource_type(base_resource_pk: int) -> BaseResource:
+RESOURCE_MODELS = (Book, Article, Course)
+
+
+def get_concrete_resource_type(base_resource_pk: int, content_type_id: int = None) -> BaseResource:
     """
-    Given the primary key of a BaseResource, this function retrieves the
+    Given the primary key of a resource, this function retrieves the
     actual concrete instance (Book, Article, or Course).
 
-    :param base_resource_pk: The ID shared by the concrete resource.
+    BaseResource is abstract (no table to fetch and probe for child objects), and
+    each concrete model numbers its rows separately, so a pk alone is ambiguous.
+    Pass the content_type_id stored next to it (Comment, UserResourceInteraction,
+    LearningGoal) to resolve the model without a query and fetch the row in one;
+    without it the concrete tables are tried in turn.
+
+    :param base_resource_pk: The ID of the concrete resource.
+    :param content_type_id: Optional ContentType ID of the concrete model.
     :return: The concrete instance of the resource.
     :raises Http404: If the resource does not exist.
     """
-    # 1. Fetch the BaseResource object
-    base_resource = get_object_or_404(BaseResource, pk=base_resource_pk)
+    if content_type_id is not None:
+        # ContentType lookups are cached by the ContentType manager
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model not in RESOURCE_MODELS:
+            raise Http404(f"Content type {content_type_id} is not a resource type")
+        return get_object_or_404(model, pk=base_resource_pk)
 
-    # 2. Determine the concrete type using Multi-Table Inheritance magic
-    # Django assigns an attribute to the parent instance that points to the child instance.
-    try:
-        # Check for each concrete model attribute that links back to the parent
-        if hasattr(base_resource, 'book'):
-            return base_resource.book
-        elif hasattr(base_resource, 'article'):
-            return base_resource.article
-        elif hasattr(base_resource, 'course'):
-            return base_resource.course
-    except (Book.DoesNotExist, Article.DoesNotExist, Course.DoesNotExist):
-        # This should theoretically not happen if the object was created correctly
-        pass
+    for model in RESOURCE_MODELS:
+        resource = model.objects.filter(pk=base_resource_pk).first()
+        if resource is not None:
+            return resource
 
-    # Fallback to the BaseResource if no concrete type is found (or raise 404)
-    # Raising a 404 is more appropriate if we strictly expect a concrete type.
-    raise models.ObjectDoesNotExist(f"No concrete resource type found for BaseResource PK: {base_resource_pk}")
\ No newline at end of file
+    raise Http404(f"No concrete resource type found for PK: {base_resource_pk}")
@@ -1,5 +1,5 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
 from django.template.defaultfilters import slugify
 from core.models import Category
@@ -7,6 +7,19 @@ from datetime import timedelta, timezone # Used for Course duration
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericRelation
 import json
+import secrets
+from django.contrib.postgres.search import SearchVector
+
+# Text-search configuration for resource full-text search (PostgreSQL only)
+RESOURCE_SEARCH_CONFIG = 'english'
+
+
+def resource_search_vector():
+    """
+    The tsvector searched by unified_search. Migration 0008 builds the GIN index
+    from this same expression, which is what lets the planner use it.
+    """
+    return SearchVector('title', 'description', config=RESOURCE_SEARCH_CONFIG)
 
 
 # --- 1. Tag Model (Unchanged) ---
@@ -21,14 +34,24 @@ class Tag(models.Model):
         ordering = ('name',)
 
     def save(self, *args, **kwargs):
+        # Keep in sync with TagsMixin.save_tags, whose bulk_create bypasses save()
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = slugify(self.name)[:self._meta.get_field('slug').max_length]
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
 # --- 2. Base Resource Model (Abstract) ---
+class BaseResourceQuerySet(models.QuerySet):
+    def with_relations(self):
+        """
+        Join author and category and prefetch tags: what the list and detail
+        templates render for every resource (instead of 2-3 queries per row).
+        """
+        return self.select_related('author', 'category').prefetch_related('tags')
+
+
 class BaseResource(models.Model):
     """
     Abstract Base Class defining all common fields for Book, Article, and Course.
@@ -80,25 +103,52 @@ class BaseResource(models.Model):
     upvote_count = models.IntegerField(default=0)
     saved_count = models.IntegerField(default=0)
 
+    # Inherited by Book/Article/Course; list/detail views call .with_relations()
+    objects = BaseResourceQuerySet.as_manager()
+
 
     class Meta:
         # KEY: Makes this an abstract class, preventing DB table creation
         abstract = True
         ordering = ('-created_at',)
 
+    # Tries at inserting with a generated slug before a collision is re-raised
+    SLUG_SAVE_ATTEMPTS = 3
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            original_slug = slugify(self.title)
-            unique_slug = original_slug
-            num = 1
-            # Check for slug uniqueness across ALL concrete models
-            while (Book.objects.filter(slug=unique_slug).exists() or
-                   Article.objects.filter(slug=unique_slug).exists() or
-                   Course.objects.filter(slug=unique_slug).exists()):
-                unique_slug = f'{original_slug}-{num}'
-                num += 1
-            self.slug = unique_slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+
+        original_slug = slugify(self.title)
+        # Slugs are unique across ALL concrete models: fetch every taken slug with
+        # this prefix from the three tables in one UNION query, then pick the first
+        # free suffix in Python
+        taken = set(
+            Book.objects.filter(slug__startswith=original_slug).order_by().values_list('slug', flat=True).union(
+                Article.objects.filter(slug__startswith=original_slug).order_by().values_list('slug', flat=True),
+                Course.objects.filter(slug__startswith=original_slug).order_by().values_list('slug', flat=True),
+            )
+        )
+        unique_slug = original_slug
+        num = 1
+        while unique_slug in taken:
+            unique_slug = f'{original_slug}-{num}'
+            num += 1
+        self.slug = unique_slug
+
+        # The check above can race with a concurrent save of the same title; the
+        # table's unique index catches that, and a random suffix is tried instead.
+        # Savepoint so a failed INSERT doesn't break an enclosing transaction
+        for attempt in range(self.SLUG_SAVE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if attempt == self.SLUG_SAVE_ATTEMPTS - 1:
+                    raise
+                self.slug = f'{original_slug}-{secrets.token_hex(3)}'
 
     def __str__(self):
         return self.title
@@ -149,6 +199,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-created_at',)
+        indexes = [
+            # A resource's comments, newest first (GenericRelation lookups + resource_detail)
+            models.Index(fields=['content_type', 'object_id', '-created_at'], name='comment_resource_recent_idx'),
+        ]
 
     def __str__(self):
         return f" Comment by {self.author.email} on {self.resource.title}"
@@ -180,6 +234,11 @@ class UserResourceInteraction(models.Model):
 
     class Meta:
         unique_together = ('user', 'content_type', 'object_id')
+        indexes = [
+            # unique_together's index leads with user; per-resource lookups (counts,
+            # GenericRelation) need the resource columns first
+            models.Index(fields=['content_type', 'object_id'], name='interaction_resource_idx'),
+        ]
         verbose_name = "User Resource Interaction"
         verbose_name_plural = "User Resource Interactions"
 
@@ -207,6 +266,12 @@ class Book(BaseResource):
     class Meta:
         verbose_name = "Book"
         verbose_name_plural = "Books"
+        indexes = [
+            models.Index(fields=['author', 'is_approved', '-created_at'], name='book_author_approved_idx'),
+            models.Index(fields=['author', '-created_at'], name='book_author_recent_idx'),
+            models.Index(fields=['is_approved', '-created_at'], name='book_approved_recent_idx'),
+            models.Index(fields=['category', '-created_at'], name='book_category_recent_idx'),
+        ]
 
 
 
@@ -234,6 +299,12 @@ class Article(BaseResource):
     class Meta:
         verbose_name = "Article"
         verbose_name_plural = "Articles"
+        indexes = [
+            models.Index(fields=['author', 'is_approved', '-created_at'], name='article_author_approved_idx'),
+            models.Index(fields=['author', '-created_at'], name='article_author_recent_idx'),
+            models.Index(fields=['is_approved', '-created_at'], name='article_approved_recent_idx'),
+            models.Index(fields=['category', '-created_at'], name='article_category_recent_idx'),
+        ]
 
 
 class Course(BaseResource):
@@ -270,6 +341,24 @@ class Course(BaseResource):
     )
     roadmap_json = models.TextField(blank=True, null=True)
 
+    # Roadmap generation runs in a Celery worker (resources.tasks); the course page polls this
+    ROADMAP_NONE = 'N'
+    ROADMAP_PENDING = 'P'
+    ROADMAP_READY = 'R'
+    ROADMAP_FAILED = 'F'
+    ROADMAP_STATUS_CHOICES = [
+        (ROADMAP_NONE, 'Not Generated'),
+        (ROADMAP_PENDING, 'Generating'),
+        (ROADMAP_READY, 'Ready'),
+        (ROADMAP_FAILED, 'Failed'),
+    ]
+    roadmap_status = models.CharField(
+        max_length=1,
+        choices=ROADMAP_STATUS_CHOICES,
+        default=ROADMAP_NONE,
+        editable=False,
+    )
+
     # Add meta data
     is_featured = models.BooleanField(default=False)
     popularity_score = models.FloatField(default=0.0)
@@ -280,6 +369,12 @@ class Course(BaseResource):
     class Meta:
         verbose_name = "Course"
         verbose_name_plural = "Courses"
+        indexes = [
+            models.Index(fields=['author', 'is_approved', '-created_at'], name='course_author_approved_idx'),
+            models.Index(fields=['author', '-created_at'], name='course_author_recent_idx'),
+            models.Index(fields=['is_approved', '-created_at'], name='course_approved_recent_idx'),
+            models.Index(fields=['category', '-created_at'], name='course_category_recent_idx'),
+        ]
 
     def get_roadmap(self):
         """Helper to return the roadmap as a python Object"""
@@ -382,4 +477,22 @@ class UserLearningStats(models.Model):
         elif self.last_learning_date != today:
             self.current_streak = 1
         self.last_learning_date = today
-        self.save()
\ No newline at end of file
+        self.save()
+
+
+# --- Generic-FK lookups by content type id ---
+
+def resource_content_type_id(model):
+    """ContentType id of a concrete resource model (cached by the ContentType manager)."""
+    return ContentType.objects.get_for_model(model).id
+
+
+def interactions_for(resource):
+    """
+    UserResourceInteraction rows for a concrete resource, filtered on the cached
+    content type id (no ContentType lookup or GenericRelation manager per call).
+    """
+    return UserResourceInteraction.objects.filter(
+        content_type_id=resource_content_type_id(type(resource)),
+        object_id=resource.pk,
+    )
@@ -87,6 +87,8 @@ def finalize_course_completion(user_progress):
         completed=True,
         status='C'  # 'C' for Completed
     )
+    # .update() sends no post_save: clear the user's cached goal board explicitly
+    LearningGoal.clear_board_cache(user_progress.user_id)
 
     # 4. Update User Profile Metrics
     profile = user_progress.user.profile
@@ -0,0 +1,26 @@
+import logging
+from celery import shared_task
+from .course_tools import generate_course_roadmap
+from .models import Course
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def generate_course_roadmap_task(course_id):
+    """
+    Builds a course's roadmap (DeepSeek + YouTube, several seconds) outside the
+    request cycle and records the outcome in Course.roadmap_status
+    """
+    course = Course.objects.filter(pk=course_id).first()
+    if course is None:
+        return
+
+    # generate_course_roadmap saves the course once, after everything succeeded,
+    # so the Ready status is written together with the roadmap
+    course.roadmap_status = Course.ROADMAP_READY
+    try:
+        generate_course_roadmap(course)
+    except Exception:
+        logger.exception(f"Error generating roadmap for course {course_id}")
+        Course.objects.filter(pk=course_id).update(roadmap_status=Course.ROADMAP_FAILED)
@@ -1,3 +1,61 @@
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import Category
+from .forms import BookForm
+from .models import Tag
+
+
+class SaveTagsSlugCollisionTests(TestCase):
+    """TagsMixin.save_tags with names whose slug is already taken (Tag.slug is unique)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Programming')
+        cls.existing = Tag.objects.create(name='c')
+
+    def save_book(self, tags_string):
+        form = BookForm(data={
+            'title': 'Systems Programming',
+            'description': 'Pointers and memory.',
+            'category': self.category.pk,
+            'difficulty': 'B',
+            'tags_string': tags_string,
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def test_name_with_taken_slug_attaches_existing_tag(self):
+        # slugify('c++') == 'c', the slug of the existing tag
+        book = self.save_book('c++, python')
+
+        self.assertEqual(Tag.objects.filter(slug='c').count(), 1)
+        self.assertQuerySetEqual(
+            book.tags.order_by('name'),
+            [self.existing, Tag.objects.get(name='python')],
+        )
+
+    def test_new_names_sharing_a_slug_create_one_tag(self):
+        book = self.save_book('Machine Learning, machine-learning')
+
+        self.assertEqual(Tag.objects.filter(slug='machine-learning').count(), 1)
+        self.assertEqual(book.tags.count(), 1)
+
+
+class SaveWithoutCommitTests(TestCase):
+    """The resource views save with commit=False, then call save_m2m()."""
+
+    def test_save_m2m_saves_tags(self):
+        category = Category.objects.create(name='Programming')
+        form = BookForm(data={
+            'title': 'Systems Programming',
+            'description': 'Pointers and memory.',
+            'category': category.pk,
+            'difficulty': 'B',
+            'tags_string': 'python, rust',
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        book = form.save(commit=False)
+        book.save()
+        form.save_m2m()
+
+        self.assertQuerySetEqual(book.tags.order_by('name').values_list('name', flat=True), ['python', 'rust'])
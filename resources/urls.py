@@ -10,6 +10,7 @@ from .views import (
     add_comment,  # NEW
     resource_update, resource_interaction, course_enroll, generate_course_ajax, regenerate_course_roadmap,
     course_analytics,  # NEW
+    course_roadmap_status,
 )
 
 urlpatterns = [
@@ -35,6 +36,7 @@ urlpatterns = [
 
     path('course/generate-ajax/', generate_course_ajax, name='generate_course_ajax'),
     path('course/<int:course_id>/regenerate/', regenerate_course_roadmap, name='regenerate_roadmap'),
+    path('course/<int:course_id>/roadmap-status/', course_roadmap_status, name='course_roadmap_status'),
 
     path('course/<int:course_id>/analytics/', course_analytics, name='course_analytics'),
 ]
\ No newline at end of file
@@ -7,6 +7,7 @@ from django.db import transaction
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponseBadRequest, Http404
 import logging
+import random
 from datetime import timedelta, timezone
 
 from django.views.decorators.http import require_POST, require_http_methods
@@ -15,7 +16,7 @@ import json
 from django.core.cache import cache
 # Import all concrete models and the base model
 from .models import BaseResource, Book, Article, Course, Tag, UserResourceInteraction, Comment, CourseProgress, \
-    ModuleProgress, UserLearningStats
+    ModuleProgress, UserLearningStats, interactions_for, resource_content_type_id
 from core.models import Category
 from goals.models import LearningGoal
 # Import all new forms
@@ -25,10 +26,19 @@ from .services import enroll_user_in_course
 from .mixins import get_concrete_resource_type
 from django.contrib.contenttypes.models import ContentType
 from .course_tools import generate_course_roadmap  # Updated to use DeepSeek
+from .tasks import generate_course_roadmap_task
 
 logger = logging.getLogger(__name__)
 
 
+def _queue_roadmap_generation(course_id):
+    """
+    Hand roadmap generation to the Celery worker once the current transaction
+    commits (so the worker sees the Pending status and cleared roadmap)
+    """
+    transaction.on_commit(lambda: generate_course_roadmap_task.delay(course_id))
+
+
 # --- 1. Resource List View (Optimized) ---
 @login_required(login_url='login')
 def resource_list(request):
@@ -41,9 +51,7 @@ def resource_list(request):
 
         # Get resources from each model
         for model in [Book, Article, Course]:
-            resources = model.objects.filter(is_approved=True).select_related(
-                'author', 'category'
-            ).prefetch_related('tags')[:50]  # Limit to prevent performance issues
+            resources = model.objects.filter(is_approved=True).with_relations()[:50]  # Limit to prevent performance issues
             all_resources.extend(list(resources))
 
         # Sort by creation date (newest first)
@@ -61,12 +69,7 @@ def resource_list(request):
         # Add interaction annotations for authenticated users
         if request.user.is_authenticated:
             for resource in page_obj.object_list:
-                resource_type = ContentType.objects.get_for_model(resource.__class__)
-                interaction = UserResourceInteraction.objects.filter(
-                    user=request.user,
-                    content_type=resource_type,
-                    object_id=resource.pk
-                ).first()
+                interaction = interactions_for(resource).filter(user=request.user).first()
 
                 resource.user_interaction = interaction
                 resource.is_upvoted = interaction.upvoted if interaction else False
@@ -103,7 +106,7 @@ def resource_detail(request, resource_slug):
 
         for model in [Book, Article, Course]:
             try:
-                found_resource = model.objects.get(slug=resource_slug, is_approved=True)
+                found_resource = model.objects.with_relations().get(slug=resource_slug, is_approved=True)
                 resource = found_resource
                 resource_model = model
                 break
@@ -133,11 +136,7 @@ def resource_detail(request, resource_slug):
         # 3. User Interaction (Likes/Bookmarks)
         user_interaction = None
         if request.user.is_authenticated:
-            user_interaction = UserResourceInteraction.objects.filter(
-                user=request.user,
-                content_type=resource_content_type,
-                object_id=resource.pk
-            ).first()
+            user_interaction = interactions_for(resource).filter(user=request.user).first()
 
         user_is_creator = request.user.is_authenticated and request.user == resource.author
 
@@ -150,15 +149,15 @@ def resource_detail(request, resource_slug):
             # Get existing roadmap or generate new one
             course_roadmap = resource.get_roadmap()
 
-            if not course_roadmap:
-                # Generate roadmap only if it doesn't exist
-                try:
-                    course_roadmap = generate_course_roadmap(resource)
-                    messages.info(request, 'Course roadmap generated successfully!')
-                except Exception as e:
-                    logger.error(f"Error generating roadmap for course {resource.id}: {str(e)}")
-                    course_roadmap = []
-                    messages.warning(request, 'Could not generate AI roadmap. Showing basic course content.')
+            if not course_roadmap and resource.roadmap_status == Course.ROADMAP_NONE:
+                # Generate the roadmap in the background (LLM + YouTube take seconds);
+                # the conditional UPDATE makes sure concurrent views queue it only once
+                claimed = Course.objects.filter(
+                    pk=resource.pk, roadmap_status=Course.ROADMAP_NONE
+                ).update(roadmap_status=Course.ROADMAP_PENDING)
+                if claimed:
+                    resource.roadmap_status = Course.ROADMAP_PENDING
+                    _queue_roadmap_generation(resource.pk)
 
             # 5. GOALS APP INTEGRATION: Fetch progress tracking object
             if request.user.is_authenticated:
@@ -177,12 +176,21 @@ def resource_detail(request, resource_slug):
 
                 # MAPPING: Match Roadmap Videos to Goal Milestones for the UI
                 if user_goal:
-                    milestones = user_goal.milestones.all()
+                    # One query for the goal's milestones, matched in Python (instead of
+                    # a filter().first() query per roadmap video)
+                    milestones = [
+                        (milestone.title.lower(), milestone)
+                        for milestone in user_goal.milestones.only('id', 'title', 'is_completed')
+                    ]
                     # We attach the actual milestone ID to the roadmap data for the AJAX buttons
                     for module in course_roadmap:
                         for video in module.get('videos', []):
                             # Find the milestone that matches this video title
-                            match = milestones.filter(title__icontains=video.get('title', '')).first()
+                            video_title = video.get('title', '').lower()
+                            match = next(
+                                (milestone for title, milestone in milestones if video_title in title),
+                                None,
+                            )
                             if match:
                                 video['milestone_id'] = match.id
                                 video['is_completed'] = match.is_completed
@@ -195,17 +203,16 @@ def resource_detail(request, resource_slug):
                     similar = model.objects.filter(
                         category=resource.category,
                         is_approved=True
-                    ).exclude(pk=resource.pk).order_by('?')[:2]
+                    ).select_related('author').exclude(pk=resource.pk).order_by('?')[:2]
                     similar_resources.extend(list(similar))
 
             if len(similar_resources) < 3:
                 same_type = resource.__class__.objects.filter(
                     category=resource.category,
                     is_approved=True
-                ).exclude(pk=resource.pk).order_by('?')[:3]
+                ).select_related('author').exclude(pk=resource.pk).order_by('?')[:3]
                 similar_resources.extend(list(same_type))
 
-            import random
             random.shuffle(similar_resources)
         except Exception as e:
             logger.error(f"Error finding similar resources: {str(e)}")
@@ -361,6 +368,7 @@ def resource_update(request, resource_slug):
                     # For courses, clear existing roadmap since content changed
                     if isinstance(resource, Course):
                         resource.roadmap_json = None
+                        resource.roadmap_status = Course.ROADMAP_NONE
 
                     resource.save()
                     form.save_m2m()
@@ -425,11 +433,9 @@ def resource_interaction(request):
             }, status=404)
 
         # Get or create UserResourceInteraction
-        content_type = ContentType.objects.get_for_model(resource_model)
-
         user_interaction, created = UserResourceInteraction.objects.get_or_create(
             user=request.user,
-            content_type=content_type,
+            content_type_id=resource_content_type_id(resource_model),
             object_id=resource.pk,
             defaults={
                 'upvoted': False,
@@ -634,7 +640,6 @@ def generate_course_ajax(request):
             return JsonResponse({'error': 'Title and description are required'}, status=400)
 
         # Create a temporary course object
-        from .models import Course
         temp_course = Course(
             title=title,
             description=description,
@@ -643,7 +648,6 @@ def generate_course_ajax(request):
         )
 
         # Generate roadmap
-        from .course_tools import generate_course_roadmap
         structured_modules = generate_course_roadmap(temp_course)
 
         # Calculate totals
@@ -720,41 +724,16 @@ def regenerate_course_roadmap(request, course_id):
         cache.set(cache_key, True, 300)
 
         with transaction.atomic():
-            # Clear existing roadmap
+            # Clear existing roadmap; the worker fills in the new one and marks it Ready
             course.roadmap_json = None
             course.estimated_duration = None
-            course.difficulty_progression = None
+            course.difficulty_progression = generate_difficulty_progression(course.difficulty)
+            course.roadmap_status = Course.ROADMAP_PENDING
             course.save()
+            _queue_roadmap_generation(course.pk)
 
-            # Regenerate roadmap
-            try:
-                structured_modules = generate_course_roadmap(course)
-
-                # Update course with new data
-                course.refresh_from_db()
-
-                # Calculate new totals
-                total_seconds = sum(module.get('duration_seconds', 0) for module in structured_modules)
-                total_videos = sum(len(module.get('videos', [])) for module in structured_modules)
-
-                # Generate difficulty progression if not present
-                if not course.difficulty_progression:
-                    difficulty_progression = generate_difficulty_progression(course.difficulty)
-                    course.difficulty_progression = difficulty_progression
-                    course.save()
-
-                messages.success(
-                    request,
-                    f"Course roadmap regenerated successfully! Found {total_videos} videos across {len(structured_modules)} modules."
-                )
-                logger.info(f"Course {course_id} roadmap regenerated by user {request.user.id}")
-
-            except Exception as e:
-                logger.error(f"Error regenerating roadmap for course {course_id}: {str(e)}")
-                messages.error(
-                    request,
-                    "Failed to regenerate roadmap. Please check your API keys or try again later."
-                )
+        messages.info(request, "Roadmap regeneration started. This page updates once it's ready.")
+        logger.info(f"Course {course_id} roadmap regeneration queued by user {request.user.id}")
 
         return redirect('resource_detail', resource_slug=course.slug)
 
@@ -764,6 +743,17 @@ def regenerate_course_roadmap(request, course_id):
         return redirect('resource_list')
 
 
+@require_http_methods(["GET"])
+def course_roadmap_status(request, course_id):
+    """
+    Polled by the course page while the roadmap is generating
+    """
+    status = Course.objects.filter(pk=course_id).values_list('roadmap_status', flat=True).first()
+    if status is None:
+        return JsonResponse({'error': 'Course not found'}, status=404)
+    return JsonResponse({'status': status, 'ready': status == Course.ROADMAP_READY})
+
+
 # Also add this helper function if not already present:
 def generate_difficulty_progression(difficulty):
     """
@@ -59,6 +59,8 @@ MIDDLEWARE = [
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    # before AuthenticationMiddleware: moves sessions off the removed ModelBackend
+    'core.middleware.LegacySessionBackendMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -70,6 +72,10 @@ ROOT_URLCONF = 'theLearning.urls'
 # Session settings
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds (default)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True  # For "remember me" functionality
+# Session reads come from the cache (Redis/Memcached, see CACHES) and only fall back
+# to django_session on a miss; writes still go to the DB so a cache flush logs no one out
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
 
 TEMPLATES = [
     {
@@ -102,6 +108,62 @@ DATABASES = {
 }
 
 
+# Cache
+# Redis when REDIS_URL is set (e.g. redis://127.0.0.1:6379/1 or unix:///run/redis.sock, needs redis),
+# Memcached when MEMCACHED_LOCATION is set (e.g. 127.0.0.1:11211, needs pymemcache),
+# per-process memory otherwise
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif os.environ.get('MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['MEMCACHED_LOCATION'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Login/register rate-limit counters (django-ratelimit) live in the default cache;
+# use Redis/Memcached in production so the counts are shared between workers
+RATELIMIT_USE_CACHE = 'default'
+
+
+# Celery
+# Course roadmap generation (DeepSeek + YouTube) runs in a worker:
+#   celery -A theLearning worker -l info
+# Without a broker (CELERY_BROKER_URL, else REDIS_URL) tasks run eagerly in-process, as before
+
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL') or os.environ.get('REDIS_URL')
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+CELERY_TASK_IGNORE_RESULT = True
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/6.0/topics/auth/passwords/#using-argon2-with-django
+# New passwords are hashed with Argon2id (Django's defaults: time_cost=2,
+# memory_cost=102400 KiB, parallelism=8). Existing PBKDF2 hashes still verify
+# and are re-hashed to Argon2 on the user's next login.
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -145,7 +207,8 @@ STATIC_URL = 'static/'
 LOGIN_URL = '/login/'
 
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    # email login + request.user loaded with its profile
+    'core.backends.EmailBackend',
 ]
 # The URL to redirect to after successful login
 LOGIN_REDIRECT_URL = 'dashboard'